@@ -0,0 +1,211 @@
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import argparse
+import subprocess
+import urllib.request
+from collections import defaultdict
+
+# End-to-end benchmark: runs the bot headless against mock_server.py and
+# reports request rates, request latency, redraws, CPU time and memory.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Startup budgets (milliseconds); the benchmark exits with status 1 when
+# either is exceeded
+IMPORT_TIME_BUDGET_MS = 150
+FIRST_STATUS_BUDGET_MS = 1000
+IMPORT_TIME_RUNS = 5
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the bot against the local mock API')
+    parser.add_argument('--duration', type=float, default=120, help='benchmark length in seconds')
+    parser.add_argument('--mode', choices=['mining', 'auto_like'], default='mining')
+    parser.add_argument('--latency', type=float, default=50, help='mock mean latency in ms')
+    parser.add_argument('--jitter', type=float, default=20, help='mock latency standard deviation in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='mock fraction of HTTP 500 responses')
+    parser.add_argument('--token-ttl', type=float, default=3600, help='mock token lifetime in seconds')
+    parser.add_argument('--hub-duration', type=float, default=60, help='mock mining session length in seconds')
+    parser.add_argument('--headless', action='store_true', help='run the bot in headless mode instead of the TUI')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS,
+                        help='maximum median time to import main.py')
+    parser.add_argument('--first-status-budget-ms', type=float, default=FIRST_STATUS_BUDGET_MS,
+                        help='maximum time from startup until the first status is shown')
+    return parser.parse_args(argv)
+
+def find_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_mock_server(args, port):
+    process = subprocess.Popen([
+        sys.executable, os.path.join(BASE_DIR, 'mock_server.py'),
+        '--port', str(port),
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate),
+        '--token-ttl', str(args.token_ttl),
+        '--hub-duration', str(args.hub_duration)
+    ])
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/__stats', timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('Mock server did not start')
+
+def measure_import_time(runs=IMPORT_TIME_RUNS):
+    """Median wall time of importing main.py in a fresh interpreter, in ms."""
+    code = 'import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)'
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.split()
+        samples.append(float(output[-1]) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+def current_rss_bytes():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def run_benchmark(args, main):
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(endpoint, method, status, elapsed):
+        latencies[endpoint].append(elapsed)
+        statuses[endpoint][str(status)] += 1
+
+    main.api.listeners.append(record)
+    devnull = open(os.devnull, 'w')
+    main.renderer.stream = devnull
+
+    commands = asyncio.Queue()
+    if args.mode == 'auto_like':
+        commands.put_nowait('3')
+
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    bot = asyncio.ensure_future(main.run_bot(
+        interactive=False,
+        commands=commands,
+        headless=args.headless,
+        status_stream=devnull
+    ))
+    await asyncio.sleep(args.duration)
+    commands.put_nowait('1')
+    await bot
+    elapsed = time.monotonic() - started
+    cpu_time = time.process_time() - cpu_started
+
+    first_status = main.metrics.time_to_first_status
+    per_hour = 3600 / elapsed
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'mode': args.mode,
+        'headless': args.headless,
+        'duration_seconds': round(elapsed, 2),
+        'endpoints': {
+            endpoint: {
+                'requests': len(values),
+                'requests_per_hour': round(len(values) * per_hour, 1),
+                'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+                'statuses': dict(statuses[endpoint])
+            }
+            for endpoint, values in sorted(latencies.items())
+        },
+        'requests_per_hour': round(len(all_latencies) * per_hour, 1),
+        'p50_ms': round(percentile(all_latencies, 0.50) * 1000, 2) if all_latencies else None,
+        'p99_ms': round(percentile(all_latencies, 0.99) * 1000, 2) if all_latencies else None,
+        'redraws': main.renderer.frames,
+        'redraws_per_hour': round(main.renderer.frames * per_hour, 1),
+        'cpu_seconds': round(cpu_time, 3),
+        'cpu_percent': round(100 * cpu_time / elapsed, 2),
+        'rss_mb': round(current_rss_bytes() / (1024 * 1024), 1),
+        'first_status_ms': round(first_status * 1000, 1) if first_status is not None else None
+    }
+
+def print_report(report):
+    print(f"Mode: {report['mode']}{' (headless)' if report['headless'] else ''}  Duration: {report['duration_seconds']}s")
+    print(f"{'endpoint':<22}{'requests':>10}{'req/hour':>12}{'p50 ms':>10}{'p99 ms':>10}  statuses")
+    for endpoint, stats in report['endpoints'].items():
+        print(
+            f"{endpoint:<22}{stats['requests']:>10}{stats['requests_per_hour']:>12}"
+            f"{stats['p50_ms']:>10}{stats['p99_ms']:>10}  {stats['statuses']}"
+        )
+    print(f"Total: {report['requests_per_hour']} req/hour, p50 {report['p50_ms']} ms, p99 {report['p99_ms']} ms")
+    print(f"Redraws: {report['redraws']} ({report['redraws_per_hour']}/hour)")
+    print(f"CPU: {report['cpu_seconds']}s ({report['cpu_percent']}%)  RSS: {report['rss_mb']} MB")
+    for name, budget in report['budgets'].items():
+        verdict = 'ok' if budget['ok'] else 'OVER BUDGET'
+        print(f"{name}: {budget['value_ms']} ms (budget {budget['budget_ms']} ms) {verdict}")
+
+def check_budgets(report, args):
+    budgets = {
+        'import_time': (report['import_ms'], args.import_budget_ms),
+        'first_status': (report['first_status_ms'], args.first_status_budget_ms)
+    }
+    report['budgets'] = {
+        name: {
+            'value_ms': value,
+            'budget_ms': budget,
+            'ok': value is not None and value <= budget
+        }
+        for name, (value, budget) in budgets.items()
+    }
+    return all(budget['ok'] for budget in report['budgets'].values())
+
+def main(argv=None):
+    args = parse_args(argv)
+    import_ms = measure_import_time()
+    port = find_free_port()
+    server = start_mock_server(args, port)
+    try:
+        # Configure the bot before importing it; settings are read at import
+        os.environ['AVEUM_API_BASE_URL'] = f'http://127.0.0.1:{port}'
+        os.environ['AVEUM_EMAIL'] = 'bench@example.com'
+        os.environ['AVEUM_PASSWORD'] = 'benchmark'
+        os.environ['AVEUM_TOKEN_CACHE'] = ''
+        os.environ['AVEUM_PROCESSED_DB'] = ''
+        os.environ['AVEUM_TIMESERIES'] = ''
+        sys.path.insert(0, BASE_DIR)
+        import main as bot
+
+        report = asyncio.run(run_benchmark(args, bot))
+    finally:
+        server.terminate()
+        server.wait()
+    
+    report['import_ms'] = round(import_ms, 1)
+    within_budget = check_budgets(report, args)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if not within_budget:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
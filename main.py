@@ -1,33 +1,32 @@
 import os
+import sys
 import time
 import random
 import json
+import stat
+import mmap
+import struct
+import argparse
+import itertools
+import base64
 import asyncio
-import aiohttp
-import blessed
-import dotenv
 import secrets
+import signal
+import queue
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 
-# Debug mode
-DEBUG = True
-
-# Load environment variables
-dotenv.load_dotenv()
-
-# Debug: Print environment variables
-if DEBUG:
-    print("DEBUG: Environment variables loaded:")
-    print(f"AVEUM_EMAIL: {os.getenv('AVEUM_EMAIL')}")
-    print(f"AVEUM_PASSWORD: {'*' * len(os.getenv('AVEUM_PASSWORD', '')) if os.getenv('AVEUM_PASSWORD') else 'None'}")
-    print(f"Current working directory: {os.getcwd()}")
-    print(f".env file exists: {os.path.exists('.env')}")
-    if os.path.exists('.env'):
-        with open('.env', 'r') as f:
-            print(f".env file contents: {f.read()}")
+# Faster JSON decoding for API responses when orjson is installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 # Constants
-API_BASE_URL = 'https://api.aveum.io'
 API_ENDPOINTS = {
     'login': '/users/login',
     'startHub': '/users/start-hub',
@@ -41,6 +40,160 @@ API_ENDPOINTS = {
     'toggleLike': '/users/toggle-like/'
 }
 
+# HTTP connection pool settings
+API_CONNECTION_LIMIT = 10
+API_KEEPALIVE_TIMEOUT = 75
+API_DNS_CACHE_TTL = 600
+
+# Request pipeline settings (seconds). Transient failures of idempotent reads
+# are retried up to RETRY_ATTEMPTS times after the first request, with
+# jittered exponential backoff; an endpoint's circuit opens after
+# CIRCUIT_FAILURE_THRESHOLD consecutive failures and lets one probe request
+# through every CIRCUIT_RESET_TIMEOUT seconds until it succeeds.
+API_REQUEST_TIMEOUT = 10
+API_CONNECT_TIMEOUT = 5
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8
+RETRYABLE_ENDPOINTS = {'hubStatus', 'profile', 'checkBan', 'discoverFeed', 'discoverOnlineUsers'}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 15
+
+# Refresh the token this many seconds before it expires, but never more
+# than TOKEN_REFRESH_FRACTION of its lifetime early. A failed proactive
+# refresh is not retried for TOKEN_REFRESH_RETRY_DELAY seconds.
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_REFRESH_FRACTION = 0.2
+TOKEN_REFRESH_RETRY_DELAY = 30
+
+# Response cache lifetimes for read endpoints (seconds)
+CACHE_TTLS = {
+    'hubStatus': 2,
+    'profile': 30,
+    'checkBan': 300
+}
+
+# Concurrent refresh settings
+REFRESH_CONCURRENCY = 4
+REFRESH_TIMEOUT = 20
+
+# Mining scheduler settings (seconds)
+MINING_RECHECK_DELAY = 2
+MINING_RETRY_DELAY = 15
+
+# Background job settings (seconds)
+SHUTDOWN_GRACE_PERIOD = 5
+RESTART_DELAY = 1
+RESTART_MAX_DELAY = 60
+AUTO_LIKE_RETRY_DELAY = 10
+
+# Metrics settings
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+RENDER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+LOOP_LAG_INTERVAL = 1.0
+
+# Logging settings
+LOG_LEVELS = {'debug': 10, 'info': 20, 'success': 25, 'warning': 30, 'error': 40}
+LOG_BUFFER_SIZE = 100
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+LOG_FLUSH_INTERVAL = 1.0
+
+# Control commands accepted on the headless control socket
+CONTROL_COMMANDS = {
+    'exit': '1',
+    'quit': '1',
+    'refresh': '2',
+    'mode': '3',
+    'profile': '4'
+}
+
+# Mining history file layout and retention. Each record is a kind byte, a
+# timestamp and four values: snapshots store current earning, hourly rate,
+# daily reward and remaining hours; claims store the reward and the claim
+# latency in seconds. Snapshots older than TIMESERIES_RAW_DAYS are reduced
+# to one per TIMESERIES_BUCKET seconds and nothing is kept past
+# TIMESERIES_MAX_DAYS.
+TIMESERIES_MAGIC = b'AVTS'
+TIMESERIES_VERSION = 1
+TIMESERIES_HEADER = struct.Struct('<4sI')
+TIMESERIES_RECORD = struct.Struct('<B7xddddd')
+TIMESERIES_SNAPSHOT = 1
+TIMESERIES_CLAIM = 2
+TIMESERIES_RAW_DAYS = 7
+TIMESERIES_MAX_DAYS = 365
+TIMESERIES_BUCKET = 3600
+TIMESERIES_COMPACT_INTERVAL = 24 * 3600
+
+# Number of recently seen user IDs kept in memory in front of the
+# processed users database
+PROCESSED_CACHE_SIZE = 5000
+
+# Response fields replaced before a cassette is written, and the endpoints
+# whose responses drive a replay step
+CASSETTE_VERSION = 1
+CASSETTE_REDACTED_FIELDS = {'token', 'email', 'password', 'device_id', 'ip_address'}
+REPLAY_DRIVERS = ('hubStatus', 'profile')
+
+# Credentials file and the template written when it is missing
+ENV_FILE = '.env'
+ENV_TEMPLATE = 'AVEUM_EMAIL=youremail@gmail.com\nAVEUM_PASSWORD=\n'
+
+def load_settings():
+    """Read the AVEUM_* settings from the environment into module globals.
+
+    Runs once at import with whatever is already in the environment, and
+    again from main() after the .env file has been loaded.
+    """
+    global DEBUG, API_BASE_URL, TOKEN_CACHE_PATH
+    global PROCESSED_DB_PATH, PROCESSED_MAX_USERS, PROCESSED_MAX_AGE_DAYS, TIMESERIES_PATH
+    global MINING_POLL_MIN_INTERVAL, MINING_POLL_MAX_INTERVAL
+    global METRICS_HOST, METRICS_PORT, LOG_LEVEL, LOG_FILE, PROFILE_DIR, UI_MAX_FPS
+    
+    # Startup diagnostics on stderr; secrets are never printed
+    DEBUG = os.getenv('AVEUM_DEBUG', '').lower() in ('1', 'true', 'yes')
+    
+    API_BASE_URL = os.getenv('AVEUM_API_BASE_URL', 'https://api.aveum.io')
+    
+    # On-disk token cache for warm restarts; set AVEUM_TOKEN_CACHE to an empty
+    # value to disable it
+    TOKEN_CACHE_PATH = os.getenv('AVEUM_TOKEN_CACHE', '.aveum_token.json')
+    
+    # Users already handled by auto-like are remembered across restarts in
+    # this SQLite file (empty keeps them in memory only), up to a number of
+    # users and a number of days
+    PROCESSED_DB_PATH = os.getenv('AVEUM_PROCESSED_DB', '.aveum_processed.db')
+    PROCESSED_MAX_USERS = int(os.getenv('AVEUM_PROCESSED_MAX_USERS', '100000'))
+    PROCESSED_MAX_AGE_DAYS = float(os.getenv('AVEUM_PROCESSED_MAX_AGE_DAYS', '30'))
+    
+    # Mining snapshots and claims are recorded here for --report; set
+    # AVEUM_TIMESERIES to an empty value to disable recording
+    TIMESERIES_PATH = os.getenv('AVEUM_TIMESERIES', '.aveum_timeseries.bin')
+    
+    # Hub status is polled for display at an adaptive rate between these
+    # bounds (seconds) and always at the session deadline
+    MINING_POLL_MIN_INTERVAL = float(os.getenv('AVEUM_MINING_POLL_MIN', '60'))
+    MINING_POLL_MAX_INTERVAL = float(os.getenv('AVEUM_MINING_POLL_MAX', '300'))
+    
+    # The Prometheus endpoint is only served when AVEUM_METRICS_PORT is set
+    METRICS_HOST = os.getenv('AVEUM_METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('AVEUM_METRICS_PORT', '0'))
+    
+    # Records below AVEUM_LOG_LEVEL are dropped before any formatting;
+    # AVEUM_LOG_FILE enables a rotating JSON-lines log file
+    LOG_LEVEL = LOG_LEVELS.get(os.getenv('AVEUM_LOG_LEVEL', 'info').lower(), LOG_LEVELS['info'])
+    LOG_FILE = os.getenv('AVEUM_LOG_FILE', '')
+    
+    # Directory for on-demand profiler captures
+    PROFILE_DIR = os.getenv('AVEUM_PROFILE_DIR', 'profiles')
+    
+    # Maximum number of UI redraws per second
+    UI_MAX_FPS = float(os.getenv('AVEUM_UI_FPS', '4'))
+
+load_settings()
+
 ANDROID_DEVICE_MODELS = [
     'SM-G9750', 'SM-G988B', 'SM-G973F', 'SM-G975F', 'SM-N975F',
     'SM-A515F', 'SM-A715F', 'SM-A516B', 'SM-A526B', 'SM-A536E',
@@ -59,51 +212,963 @@ BOT_MODE = {
 
 # Global variables
 current_bot_mode = BOT_MODE['MINING']
-auto_like_running = False
 processed_post_ids = set()
-processed_user_ids = set()
 total_liked = 0
 
-# Create UI
-term = blessed.Terminal()
+# Terminal, created by init_terminal() unless the bot runs headless
+term = None
 
-# UI state variables
-user_info_content = 'Loading user info...'
-mining_status_content = 'Loading mining status...'
-auto_like_status_content = 'Auto Like status will appear here when active'
-log_messages = []
+# UI state variables. These hold plain data; the terminal renderer or the
+# headless reporter decides how to present them.
+user_info_state = {'status': 'loading'}
+mining_state = {'status': 'loading'}
+# Unrounded time at which the current mining session can be claimed
+mining_deadline = None
+# Last parsed responses behind the states above; an equal response skips the update
+current_profile = None
+current_hub_status = None
+auto_like_state = {'status': 'idle'}
 current_mode = 'MINING'
 
+# Logging
+class LogRecord:
+    __slots__ = ('created', 'level', 'message', 'args', '_display')
+
+    def __init__(self, created, level, message, args):
+        self.created = created
+        self.level = level
+        self.message = message
+        self.args = args
+        self._display = None
+
+    def text(self):
+        return self.message % self.args if self.args else self.message
+
+    def display(self):
+        """Colored terminal line for this record, formatted on first use."""
+        if self._display is None:
+            timestamp = datetime.fromtimestamp(self.created).strftime('%H:%M:%S')
+            color = {'error': term.red, 'success': term.green, 'warning': term.yellow}.get(self.level, term.white)
+            self._display = f"{color}[{timestamp}] {self.text()}{term.normal}"
+        return self._display
+
+    def to_dict(self):
+        return {
+            'time': datetime.fromtimestamp(self.created).isoformat(timespec='milliseconds'),
+            'level': self.level,
+            'message': self.text()
+        }
+
+class LogStore:
+    """Fixed-size ring buffer of log records with level filtering."""
+
+    def __init__(self, capacity, level):
+        self.level = level
+        self.records = deque(maxlen=capacity)
+        self.sinks = []
+
+    def is_enabled(self, level):
+        return LOG_LEVELS.get(level, LOG_LEVELS['info']) >= self.level
+
+    def add(self, level, message, args):
+        if not self.is_enabled(level):
+            return None
+        record = LogRecord(time.time(), level, message, args)
+        self.records.append(record)
+        for sink in self.sinks:
+            sink.emit(record)
+        return record
+
+    def tail(self, count):
+        return itertools.islice(self.records, max(0, len(self.records) - count), None)
+
+class JsonLinesSink:
+    """Writes log records as JSON lines from a background thread.
+
+    Records are queued without formatting and written in batches every
+    LOG_FLUSH_INTERVAL seconds, rotating the file once it exceeds max_bytes.
+    """
+
+    def __init__(self, path, max_bytes=LOG_FILE_MAX_BYTES, backups=LOG_FILE_BACKUPS, flush_interval=LOG_FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        self._queue.put(record)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        running = True
+        while running:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:
+                running = False
+                batch = [record for record in batch if record is not None]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        data = ''.join(json.dumps(record.to_dict(), ensure_ascii=False) + '\n' for record in batch)
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(data)
+        except OSError:
+            pass
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f'{self.path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index + 1}')
+        if self.backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+
+# Create log store instance
+log_store = LogStore(LOG_BUFFER_SIZE, LOG_LEVEL)
+
+# Metrics
+class Histogram:
+    """Fixed-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Approximate quantile, reported as the upper bound of its bucket."""
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def prometheus_lines(self, name, labels=''):
+        prefix = f'{labels},' if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.sum}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+class Metrics:
+    """Request, render and event-loop instrumentation for the bot."""
+
+    def __init__(self):
+        self.requests = Counter()
+        self.request_latency = {}
+        self.all_request_latency = Histogram(LATENCY_BUCKETS)
+        self.iteration_time = {}
+        self.render_time = Histogram(RENDER_BUCKETS)
+        self.decode_time = Histogram(RENDER_BUCKETS)
+        self.loop_lag = Histogram(LOOP_LAG_BUCKETS)
+        self.last_loop_lag = 0.0
+        self.retries = Counter()
+        # Seconds from run_bot() start until user info and hub status loaded
+        self.time_to_first_status = None
+        # Called with (name, seconds) for every timed loop iteration, frame and
+        # decoded response
+        self.span_listeners = []
+
+    def observe_request(self, endpoint, method, status, elapsed):
+        self.requests[(endpoint, 'error' if status is None else str(status))] += 1
+        if endpoint not in self.request_latency:
+            self.request_latency[endpoint] = Histogram(LATENCY_BUCKETS)
+        self.request_latency[endpoint].observe(elapsed)
+        self.all_request_latency.observe(elapsed)
+
+    def observe_iteration(self, loop_name, elapsed):
+        if loop_name not in self.iteration_time:
+            self.iteration_time[loop_name] = Histogram(LATENCY_BUCKETS)
+        self.iteration_time[loop_name].observe(elapsed)
+        for listener in self.span_listeners:
+            listener(loop_name, elapsed)
+
+    def observe_render(self, elapsed):
+        self.render_time.observe(elapsed)
+        for listener in self.span_listeners:
+            listener('render', elapsed)
+
+    def observe_decode(self, elapsed):
+        self.decode_time.observe(elapsed)
+        for listener in self.span_listeners:
+            listener('decode', elapsed)
+
+    @contextmanager
+    def time_iteration(self, loop_name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_iteration(loop_name, time.perf_counter() - started)
+
+    def observe_loop_lag(self, lag):
+        self.last_loop_lag = lag
+        self.loop_lag.observe(lag)
+
+    def count_retry(self, kind):
+        self.retries[kind] += 1
+
+    def observe_startup(self, elapsed):
+        if self.time_to_first_status is None:
+            self.time_to_first_status = elapsed
+
+    def render_prometheus(self):
+        lines = [
+            '# HELP aveum_requests_total API requests by endpoint and HTTP status.',
+            '# TYPE aveum_requests_total counter'
+        ]
+        for (endpoint, status), count in sorted(self.requests.items()):
+            lines.append(f'aveum_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+        
+        lines.append('# HELP aveum_request_duration_seconds API request latency by endpoint.')
+        lines.append('# TYPE aveum_request_duration_seconds histogram')
+        for endpoint, histogram in sorted(self.request_latency.items()):
+            lines.extend(histogram.prometheus_lines('aveum_request_duration_seconds', f'endpoint="{endpoint}"'))
+        
+        lines.append('# HELP aveum_loop_iteration_duration_seconds Duration of one iteration of each background loop.')
+        lines.append('# TYPE aveum_loop_iteration_duration_seconds histogram')
+        for loop_name, histogram in sorted(self.iteration_time.items()):
+            lines.extend(histogram.prometheus_lines('aveum_loop_iteration_duration_seconds', f'loop="{loop_name}"'))
+        
+        lines.append('# HELP aveum_cache_requests_total Response cache lookups by result.')
+        lines.append('# TYPE aveum_cache_requests_total counter')
+        lines.append(f'aveum_cache_requests_total{{result="hit"}} {response_cache.hits}')
+        lines.append(f'aveum_cache_requests_total{{result="miss"}} {response_cache.misses}')
+        
+        lines.append('# HELP aveum_retries_total Request retries by kind.')
+        lines.append('# TYPE aveum_retries_total counter')
+        for kind, count in sorted(self.retries.items()):
+            lines.append(f'aveum_retries_total{{kind="{kind}"}} {count}')
+        
+        lines.append('# HELP aveum_circuit_state Current circuit breaker state by endpoint.')
+        lines.append('# TYPE aveum_circuit_state gauge')
+        for endpoint, breaker in sorted(api.breakers.items()):
+            for state in ('closed', 'open', 'half_open'):
+                lines.append(f'aveum_circuit_state{{endpoint="{endpoint}",state="{state}"}} {int(breaker.state == state)}')
+        
+        lines.append('# HELP aveum_frames_total Terminal frames written.')
+        lines.append('# TYPE aveum_frames_total counter')
+        lines.append(f'aveum_frames_total {renderer.frames}')
+        lines.append('# HELP aveum_render_duration_seconds Time spent building and writing one frame.')
+        lines.append('# TYPE aveum_render_duration_seconds histogram')
+        lines.extend(self.render_time.prometheus_lines('aveum_render_duration_seconds'))
+        lines.append('# HELP aveum_decode_duration_seconds Time spent decoding one JSON response body.')
+        lines.append('# TYPE aveum_decode_duration_seconds histogram')
+        lines.extend(self.decode_time.prometheus_lines('aveum_decode_duration_seconds'))
+        
+        lines.append('# HELP aveum_event_loop_lag_seconds Delay of scheduled event loop wakeups.')
+        lines.append('# TYPE aveum_event_loop_lag_seconds histogram')
+        lines.extend(self.loop_lag.prometheus_lines('aveum_event_loop_lag_seconds'))
+        
+        if self.time_to_first_status is not None:
+            lines.append('# HELP aveum_time_to_first_status_seconds Time from startup until the first status was shown.')
+            lines.append('# TYPE aveum_time_to_first_status_seconds gauge')
+            lines.append(f'aveum_time_to_first_status_seconds {self.time_to_first_status:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def summary_lines(self):
+        total = sum(self.requests.values())
+        errors = sum(count for (endpoint, status), count in self.requests.items() if status == 'error' or int(status) >= 400)
+        p50 = self.all_request_latency.quantile(0.5)
+        p99 = self.all_request_latency.quantile(0.99)
+        lookups = response_cache.hits + response_cache.misses
+        hit_rate = f'{100 * response_cache.hits / lookups:.0f}%' if lookups else '-'
+        render_p50 = self.render_time.quantile(0.5)
+        return [
+            f"API: {total} req, {errors} err | p50 <= {format_seconds(p50)} p99 <= {format_seconds(p99)} | cache hit {hit_rate} | retries {sum(self.retries.values())}",
+            f"Loop lag: {format_seconds(self.last_loop_lag)} | render p50 <= {format_seconds(render_p50)}"
+        ]
+
+def format_seconds(value):
+    if value is None:
+        return '-'
+    if value == float('inf'):
+        return 'inf'
+    return f'{value * 1000:.1f}ms'
+
+# Create metrics instance
+metrics = Metrics()
+
+# Profiler
+class Profiler:
+    """On-demand profiling window for the running bot.
+
+    While active, cProfile records per-function times and the wall time of
+    every API request, loop iteration and frame is collected. Nothing is
+    hooked while inactive, so there is no overhead outside a capture.
+    """
+
+    def __init__(self):
+        self._profile = None
+        self._started_at = None
+        self._wall_times = defaultdict(list)
+
+    def is_active(self):
+        return self._profile is not None
+
+    def _record_request(self, endpoint, method, status, elapsed):
+        self._wall_times[f'api.{endpoint}'].append(elapsed)
+
+    def _record_span(self, name, elapsed):
+        self._wall_times[name].append(elapsed)
+
+    def start(self):
+        import cProfile
+        
+        self._wall_times = defaultdict(list)
+        self._started_at = datetime.now()
+        api.listeners.append(self._record_request)
+        metrics.span_listeners.append(self._record_span)
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        log_message('Profiler started. Run the command again to stop and save.', 'info')
+
+    def stop(self):
+        import io
+        import pstats
+        
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+        api.listeners.remove(self._record_request)
+        metrics.span_listeners.remove(self._record_span)
+        
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base_path = os.path.join(PROFILE_DIR, f"aveum-{self._started_at.strftime('%Y%m%d-%H%M%S')}")
+        profile.dump_stats(f'{base_path}.prof')
+        
+        report = io.StringIO()
+        duration = (datetime.now() - self._started_at).total_seconds()
+        report.write(f'Profile window: {self._started_at.isoformat()} ({duration:.1f} s)\n\n')
+        report.write('Coroutine wall time\n')
+        report.write(f"{'name':<32}{'calls':>8}{'total s':>12}{'mean ms':>12}{'max ms':>12}\n")
+        for name, values in sorted(self._wall_times.items(), key=lambda item: -sum(item[1])):
+            report.write(
+                f'{name:<32}{len(values):>8}{sum(values):>12.4f}'
+                f'{1000 * sum(values) / len(values):>12.2f}{1000 * max(values):>12.2f}\n'
+            )
+        report.write('\nFunctions by cumulative time\n')
+        pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(50)
+        with open(f'{base_path}.txt', 'w') as f:
+            f.write(report.getvalue())
+        
+        log_message(f'Profiler stopped. Results written to {base_path}.txt/.prof', 'success')
+        return base_path
+
+    def toggle(self):
+        if self.is_active():
+            return self.stop()
+        self.start()
+        return None
+
+# Create profiler instance
+profiler = Profiler()
+
+async def monitor_loop_lag():
+    while True:
+        started = time.monotonic()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        shown = format_seconds(metrics.last_loop_lag)
+        metrics.observe_loop_lag(max(0.0, time.monotonic() - started - LOOP_LAG_INTERVAL))
+        # Nothing else may redraw for a while, so keep the panel current
+        if format_seconds(metrics.last_loop_lag) != shown:
+            render_ui()
+
+async def serve_metrics():
+    from aiohttp import web
+    
+    async def handle_metrics(request):
+        return web.Response(text=metrics.render_prometheus(), content_type='text/plain', charset='utf-8',
+                            headers={'X-Content-Type-Options': 'nosniff'})
+    
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+        log_message(f'Serving metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics', 'info')
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+# API errors
+class AuthError(Exception):
+    """Raised when a request is still rejected as unauthorized after re-login."""
+
+    def __init__(self, status):
+        super().__init__(f'Request unauthorized (HTTP {status})')
+        self.status = status
+
+class ApiError(Exception):
+    """Raised when the API answers with an error status."""
+
+    def __init__(self, endpoint, status):
+        super().__init__(f'{endpoint} failed (HTTP {status})')
+        self.endpoint = endpoint
+        self.status = status
+
+class CircuitOpenError(Exception):
+    """Raised without sending a request while an endpoint's circuit is open."""
+
+    def __init__(self, endpoint, retry_after):
+        super().__init__(f'{endpoint} is unavailable, retrying in {retry_after:.0f} seconds')
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+# Circuit breaker
+class CircuitBreaker:
+    """Fails fast for an endpoint that keeps failing.
+
+    Closed: requests pass and consecutive failures are counted. Open: requests
+    are rejected until ``reset_timeout`` has passed. Half-open: a single probe
+    is let through; its success closes the circuit, its failure reopens it.
+    """
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self):
+        if self.state == 'open':
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = 'half_open'
+        if self.state == 'half_open':
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def retry_after(self):
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self):
+        """Returns True if this closed a circuit that was not closed."""
+        recovered = self.state != 'closed'
+        self.state = 'closed'
+        self.failures = 0
+        self._probing = False
+        return recovered
+
+    def record_failure(self):
+        """Returns True if this opened the circuit."""
+        self.failures += 1
+        self._probing = False
+        if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+            self.state = 'open'
+            self._opened_at = time.monotonic()
+            return True
+        return False
+
+    def release(self):
+        # A cancelled probe neither proves nor disproves recovery
+        self._probing = False
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given zero-based retry."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+# API client
+class ApiClient:
+    """Long-lived HTTP client sharing one pooled session across all API calls.
+
+    Every request has a timeout and goes through its endpoint's circuit
+    breaker; idempotent reads are retried on transient failures.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.token = None
+        self.auth = None
+        self.closing = False
+        self.listeners = []
+        self.breakers = defaultdict(CircuitBreaker)
+        # Coroutine returning (status, body); replaced when replaying a cassette
+        self.transport = self._fetch
+        # Receives every decoded response when recording a cassette
+        self.recorder = None
+        self._inflight = 0
+        self._session = None
+
+    def _get_session(self):
+        # The session must be created inside the running event loop, so it is
+        # opened lazily on first use and reused until close() is called.
+        if self._session is None or self._session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(
+                limit=API_CONNECTION_LIMIT,
+                ttl_dns_cache=API_DNS_CACHE_TTL,
+                keepalive_timeout=API_KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=get_headers(),
+                timeout=aiohttp.ClientTimeout(total=API_REQUEST_TIMEOUT, connect=API_CONNECT_TIMEOUT)
+            )
+        return self._session
+
+    def set_token(self, token):
+        self.token = token
+
+    def _request_headers(self, token):
+        if token:
+            return {'authorization': f'Bearer {token}'}
+        return None
+
+    async def _fetch(self, method, endpoint, suffix, params, json, token):
+        """Default transport: returns the status and, for successes, the raw body."""
+        session = self._get_session()
+        async with session.request(
+            method,
+            f"{self.base_url}{API_ENDPOINTS[endpoint]}{suffix}",
+            params=params,
+            json=json,
+            headers=self._request_headers(token)
+        ) as response:
+            if response.status >= 400:
+                return response.status, None
+            return response.status, await response.read()
+
+    async def _send(self, method, endpoint, suffix, params, json, token):
+        status = None
+        started = time.perf_counter()
+        self._inflight += 1
+        try:
+            status, body = await self.transport(method, endpoint, suffix, params, json, token)
+            data = None
+            if body and body.strip():
+                decode_started = time.perf_counter()
+                data = json_loads(body)
+                metrics.observe_decode(time.perf_counter() - decode_started)
+            if self.recorder is not None:
+                self.recorder.record(method, endpoint, suffix, params, status, data, time.perf_counter() - started)
+            return status, data
+        finally:
+            self._inflight -= 1
+            # Listeners receive every completed or failed request; status is
+            # None when no response was received
+            elapsed = time.perf_counter() - started
+            for listener in self.listeners:
+                listener(endpoint, method, status, elapsed)
+
+    async def _call(self, method, endpoint, suffix, params, json, token):
+        """Send one request through the endpoint's circuit breaker.
+
+        Returns ``(status, data)`` for successes and auth failures, and raises
+        ApiError, CircuitOpenError or the transport error otherwise.
+        """
+        breaker = self.breakers[endpoint]
+        attempts = RETRY_ATTEMPTS + 1 if method == 'GET' and endpoint in RETRYABLE_ENDPOINTS else 1
+        for attempt in range(attempts):
+            if self.closing:
+                raise RuntimeError('API client is shutting down')
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint, breaker.retry_after())
+            
+            try:
+                status, data = await self._send(method, endpoint, suffix, params, json, token)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except asyncio.TimeoutError:
+                failure = TimeoutError(f'{endpoint} timed out after {API_REQUEST_TIMEOUT} seconds')
+            except Exception as error:
+                failure = error
+            else:
+                if status not in RETRYABLE_STATUSES:
+                    # Any other answer means the endpoint is up
+                    if breaker.record_success():
+                        log_message('API endpoint %s recovered', 'success', endpoint)
+                    if status >= 400 and status not in (401, 403):
+                        raise ApiError(endpoint, status)
+                    return status, data
+                failure = ApiError(endpoint, status)
+            
+            if breaker.record_failure():
+                log_message('API endpoint %s is failing; pausing requests for %d seconds', 'warning', endpoint, breaker.reset_timeout)
+            if attempt + 1 >= attempts or breaker.state == 'open':
+                raise failure
+            metrics.count_retry('transient')
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def request(self, method, endpoint, suffix='', params=None, json=None, authenticated=True):
+        if not authenticated or self.auth is None:
+            status, data = await self._call(method, endpoint, suffix, params, json, None)
+            if status in (401, 403):
+                raise AuthError(status)
+            return data
+        
+        await self.auth.ensure_fresh()
+        token = self.token
+        status, data = await self._call(method, endpoint, suffix, params, json, token)
+        
+        if status in (401, 403):
+            # The token was rejected: re-login once (shared with any other
+            # caller that hit the same failure) and replay the request
+            if not await self.auth.relogin(stale_token=token):
+                raise AuthError(status)
+            metrics.count_retry('auth_replay')
+            status, data = await self._call(method, endpoint, suffix, params, json, self.token)
+            if status in (401, 403):
+                raise AuthError(status)
+        
+        return data
+
+    async def get(self, endpoint, suffix='', params=None):
+        return await self.request('GET', endpoint, suffix, params=params)
+
+    async def post(self, endpoint, suffix='', json=None, authenticated=True):
+        return await self.request('POST', endpoint, suffix, json={} if json is None else json, authenticated=authenticated)
+
+    async def drain(self, timeout):
+        """Stop accepting new requests and wait for in-flight ones to finish."""
+        self.closing = True
+        deadline = time.monotonic() + timeout
+        while self._inflight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+# Create API client instance
+api = ApiClient(API_BASE_URL)
+api.listeners.append(metrics.observe_request)
+
+# Response cache
+class ResponseCache:
+    """TTL cache for read endpoints with in-flight request deduplication.
+
+    Concurrent callers asking for the same key while a fetch is running share
+    that fetch instead of issuing their own request.
+    """
+
+    def __init__(self, ttls):
+        self.ttls = ttls
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._inflight = {}
+
+    async def get(self, key, fetch):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        
+        future = self._inflight.get(key)
+        if future is not None:
+            self.hits += 1
+            return await asyncio.shield(future)
+        
+        self.misses += 1
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            # An invalidation while the fetch was running replaces or removes
+            # the in-flight entry, in which case the result must not be stored
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    self._entries[key] = (time.monotonic() + self.ttls.get(key, 0), future.result())
+        return value
+
+    def invalidate(self, *keys):
+        for key in keys or list(self._entries) + list(self._inflight):
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+# Create response cache instance
+response_cache = ResponseCache(CACHE_TTLS)
+
+def parse_token_claims(token):
+    """Return the claims of a JWT, or an empty dict if they cannot be read."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else {}
+    except Exception:
+        return {}
+
+def read_claim_time(claims, key):
+    try:
+        return float(claims[key])
+    except Exception:
+        return None
+
+def parse_token_expiry(token):
+    """Return the expiry timestamp of a JWT, or None if it cannot be read."""
+    return read_claim_time(parse_token_claims(token), 'exp')
+
+def token_refresh_time(token, issued_at=None):
+    """Return when a token should be refreshed, or None if its expiry is unknown.
+
+    The margin before expiry is TOKEN_REFRESH_MARGIN, clamped to a fraction
+    of the token's lifetime. The lifetime runs from the JWT ``iat`` claim,
+    falling back to ``issued_at`` (the login time) and then to now.
+    """
+    claims = parse_token_claims(token)
+    expires_at = read_claim_time(claims, 'exp')
+    if expires_at is None:
+        return None
+    issued = read_claim_time(claims, 'iat') or issued_at or time.time()
+    lifetime = max(expires_at - issued, 0)
+    return expires_at - min(TOKEN_REFRESH_MARGIN, lifetime * TOKEN_REFRESH_FRACTION)
+
+# Response models
+def read_number(data, key):
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f'{key} must be a number, got {value!r}')
+    return value
+
+def read_display_number(data, key):
+    """Read a field that is only displayed, never rejecting the response.
+
+    Numeric strings are converted; any other value is passed through as-is.
+    """
+    value = data.get(key)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+def read_flag(data, key):
+    value = data.get(key)
+    if value is not None and not isinstance(value, (bool, int, float)):
+        raise ValueError(f'{key} must be a boolean, got {value!r}')
+    return bool(value)
+
+def read_object(data, name):
+    if not isinstance(data, dict):
+        raise ValueError(f'{name} response must be an object, got {type(data).__name__}')
+    return data
+
+@dataclass(frozen=True)
+class HubStatus:
+    """Parsed hub-status response; remaining_time is in hours.
+
+    Only is_active and remaining_time drive scheduling, so only they are
+    validated; the other fields are display-only.
+    """
+    __slots__ = ('is_active', 'start_time', 'daily_reward', 'current_earning', 'hourly_rate', 'remaining_time')
+    is_active: bool
+    start_time: object
+    daily_reward: object
+    current_earning: object
+    hourly_rate: object
+    remaining_time: float
+
+    @classmethod
+    def from_json(cls, data):
+        data = read_object(data, 'hubStatus')
+        return cls(
+            is_active=read_flag(data, 'isHub'),
+            start_time=data.get('startTime'),
+            daily_reward=read_display_number(data, 'dailyReward'),
+            current_earning=read_display_number(data, 'currentEarning'),
+            hourly_rate=read_display_number(data, 'hourlyRate'),
+            remaining_time=read_number(data, 'remainingTime') or 0
+        )
+
+@dataclass(frozen=True)
+class Profile:
+    """Parsed profile response; banned is None when the profile has no ban field."""
+    __slots__ = ('username', 'email', 'all_reward', 'banned')
+    username: object
+    email: object
+    all_reward: object
+    banned: object
+
+    @classmethod
+    def from_json(cls, data):
+        data = read_object(data, 'profile')
+        return cls(
+            username=data.get('username'),
+            email=data.get('email'),
+            all_reward=read_display_number(data, 'all_reward'),
+            banned=bool(data['ban']) if data.get('ban') is not None else None
+        )
+
+@dataclass(frozen=True)
+class LoginResponse:
+    """Parsed login response with the token's expiry read once."""
+    __slots__ = ('token', 'expires_at')
+    token: str
+    expires_at: object
+
+    @classmethod
+    def from_json(cls, data):
+        token = read_object(data, 'login').get('token')
+        if not isinstance(token, str) or not token:
+            raise ValueError('login response has no token')
+        return cls(token=token, expires_at=parse_token_expiry(token))
+
 # Authentication class
 class Auth:
-    def __init__(self):
+    """Owns the session token and its lifecycle.
+
+    Tokens are refreshed shortly before their JWT expiry (see
+    token_refresh_time), and concurrent re-login requests share a single
+    login call.
+    """
+
+    def __init__(self, client):
+        self.client = client
         self.token = None
+        self.expires_at = None
+        self.issued_at = None
+        self.refresh_at = None
+        self._refresh_retry_at = 0
+        self._login_task = None
+        # Cassette replay serves recorded logins without real credentials
+        self.require_credentials = True
+        client.auth = self
     
     async def login(self):
         try:
             log_message('Logging in to Aveum...', 'info')
             
-            if not os.getenv('AVEUM_EMAIL') or not os.getenv('AVEUM_PASSWORD'):
+            if self.require_credentials and (not os.getenv('AVEUM_EMAIL') or not os.getenv('AVEUM_PASSWORD')):
                 log_message('Error: Missing email or password in .env file!', 'error')
-                os._exit(1)
+                return False
             
             payload = get_login_payload()
-            headers = get_headers()
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{API_BASE_URL}{API_ENDPOINTS['login']}", 
-                    json=payload, 
-                    headers=headers
-                ) as response:
-                    data = await response.json()
-                    self.token = data['token']
-                    log_message('Login successful! Token received.', 'success')
-                    return True
+            issued_at = time.time()
+            response = LoginResponse.from_json(await self.client.post('login', json=payload, authenticated=False))
+            self.set_token(response.token, response.expires_at, issued_at)
+            self.save_cached_token()
+            log_message('Login successful! Token received.', 'success')
+            return True
         except Exception as error:
             log_message(f'Login failed: {str(error)}', 'error')
             return False
     
+    def load_cached_token(self):
+        """Restore a still-valid token saved by a previous run.
+
+        Tokens with an unknown expiry are reused too; if the API rejects one,
+        the normal re-login path takes over.
+        """
+        if not TOKEN_CACHE_PATH:
+            return False
+        try:
+            with open(TOKEN_CACHE_PATH, 'r') as f:
+                cached = json.load(f)
+            if cached.get('email') != os.getenv('AVEUM_EMAIL') or not cached.get('token'):
+                return False
+            refresh_at = token_refresh_time(cached['token'], cached.get('issued_at'))
+            if refresh_at is not None and time.time() >= refresh_at:
+                return False
+            self.set_token(cached['token'], issued_at=cached.get('issued_at'))
+            log_message('Using cached token from previous session.', 'success')
+            return True
+        except Exception:
+            return False
+    
+    def save_cached_token(self):
+        if not TOKEN_CACHE_PATH:
+            return
+        try:
+            temp_path = f'{TOKEN_CACHE_PATH}.tmp'
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'email': os.getenv('AVEUM_EMAIL'),
+                    'token': self.token,
+                    'expires_at': self.expires_at,
+                    'issued_at': self.issued_at
+                }, f)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, TOKEN_CACHE_PATH)
+        except Exception as error:
+            log_message(f'Could not save token cache: {str(error)}', 'warning')
+    
+    def set_token(self, token, expires_at=None, issued_at=None):
+        self.token = token
+        self.expires_at = expires_at if expires_at is not None else parse_token_expiry(token)
+        self.issued_at = issued_at
+        self.refresh_at = token_refresh_time(token, issued_at)
+        self._refresh_retry_at = 0
+        self.client.set_token(token)
+        response_cache.invalidate()
+    
+    async def relogin(self, stale_token=None):
+        """Log in again, joining a login that is already in progress.
+
+        If ``stale_token`` is given and has already been replaced by another
+        caller's re-login, the current token is used without logging in.
+        """
+        if self._login_task is None:
+            if stale_token is not None and self.token and self.token != stale_token:
+                return True
+            self._login_task = asyncio.ensure_future(self.login())
+            # Cleared by the task itself, since every waiter may be cancelled
+            self._login_task.add_done_callback(self._clear_login_task)
+        return await asyncio.shield(self._login_task)
+    
+    def _clear_login_task(self, task):
+        if self._login_task is task:
+            self._login_task = None
+    
+    async def ensure_fresh(self):
+        now = time.time()
+        if self.refresh_at is None or now < self.refresh_at or now < self._refresh_retry_at:
+            return
+        log_message('Token is about to expire. Refreshing...', 'info')
+        if not await self.relogin(stale_token=self.token):
+            self._refresh_retry_at = time.time() + TOKEN_REFRESH_RETRY_DELAY
+    
     def get_token(self):
         return self.token
     
@@ -111,7 +1176,7 @@ class Auth:
         return bool(self.token)
 
 # Create auth instance
-auth = Auth()
+auth = Auth(api)
 
 # Helper functions
 def generate_random_device_id():
@@ -166,364 +1231,656 @@ def format_time_remaining(hours):
     
     return f"{h:02d}:{m:02d}:{s:02d}"
 
-def log_message(message, type='info'):
-    global log_messages
-    timestamp = datetime.now().strftime('%H:%M:%S')
-    
-    if type == 'error':
-        colored_message = f"{term.red}[{timestamp}] {message}{term.normal}"
-    elif type == 'success':
-        colored_message = f"{term.green}[{timestamp}] {message}{term.normal}"
-    elif type == 'warning':
-        colored_message = f"{term.yellow}[{timestamp}] {message}{term.normal}"
-    else:
-        colored_message = f"{term.white}[{timestamp}] {message}{term.normal}"
+async def gather_bounded(*coroutines, limit=REFRESH_CONCURRENCY, timeout=REFRESH_TIMEOUT):
+    """Run independent coroutines concurrently, at most ``limit`` at a time.
+
+    Each coroutine gets its own timeout, so one slow call cannot hold up the
+    rest. Results come back in order, with exceptions returned in place.
+    """
+    semaphore = asyncio.Semaphore(limit)
     
-    log_messages.append(colored_message)
-    if len(log_messages) > 100:  # Keep only the last 100 messages
-        log_messages = log_messages[-100:]
+    async def run(coroutine):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(coroutine, timeout)
+            except asyncio.TimeoutError:
+                log_message(f'{coroutine.__qualname__} timed out after {timeout} seconds', 'warning')
+                raise
     
-    render_ui()
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines), return_exceptions=True)
+
+def log_message(message, type='info', *args):
+    """Log a message at the given level ('debug', 'info', 'success', 'warning' or 'error').
+
+    Extra ``args`` are %-formatted into the message only if the record is
+    displayed or written, so filtered records cost almost nothing.
+    """
+    if log_store.add(type, message, args) is not None:
+        render_ui()
+
+def close_log_sinks():
+    for sink in log_store.sinks:
+        sink.close()
+    log_store.sinks.clear()
 
 # API functions
+# Read responses are parsed into models once, before they are cached
+async def fetch_profile():
+    return Profile.from_json(await api.get('profile'))
+
+async def fetch_hub_status():
+    return HubStatus.from_json(await api.get('hubStatus'))
+
 async def get_user_profile():
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}{API_ENDPOINTS['profile']}", 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                return data
+        return await response_cache.get('profile', fetch_profile)
     except Exception as error:
         log_message(f'Error fetching user profile: {str(error)}', 'error')
         return None
 
 async def check_user_ban():
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}{API_ENDPOINTS['checkBan']}", 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                return data
+        return await response_cache.get('checkBan', lambda: api.get('checkBan'))
     except Exception as error:
         log_message(f'Error checking ban status: {str(error)}', 'error')
         return {'banned': False}
 
 async def start_hub_mining():
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{API_BASE_URL}{API_ENDPOINTS['startHub']}", 
-                json={}, 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                log_message('✅ Hub mining started successfully!', 'success')
-                log_message(f"Start time: {data['startTime']}", 'info')
-                return data
+        data = await api.post('startHub')
+        log_message('✅ Hub mining started successfully!', 'success')
+        log_message(f"Start time: {data['startTime']}", 'info')
+        return data
     except Exception as error:
         log_message(f'❌ Error starting hub mining: {str(error)}', 'error')
         return None
+    finally:
+        response_cache.invalidate('hubStatus')
 
 async def claim_reward():
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{API_BASE_URL}{API_ENDPOINTS['claimReward']}", 
-                json={}, 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                log_message('✅ Reward claimed successfully!', 'success')
-                if data and 'reward' in data:
-                    log_message(f"Claimed {data['reward']} AVEUM!", 'success')
-                return data
+        data = await api.post('claimReward')
+        log_message('✅ Reward claimed successfully!', 'success')
+        if data and 'reward' in data:
+            log_message(f"Claimed {data['reward']} AVEUM!", 'success')
+        return data
     except Exception as error:
         log_message(f'❌ Error claiming reward: {str(error)}', 'error')
         return None
+    finally:
+        response_cache.invalidate('hubStatus', 'profile')
 
 async def get_hub_status():
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}{API_ENDPOINTS['hubStatus']}", 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                return data
+        return await response_cache.get('hubStatus', fetch_hub_status)
     except Exception as error:
         log_message(f'Error fetching hub status: {str(error)}', 'error')
         return None
 
 async def get_discover_feed(page=1, limit=20):
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}{API_ENDPOINTS['discoverFeed']}?page={page}&limit={limit}", 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                
-                # Log the structure for debugging
-                log_message(f"Received discover feed data. Response structure: {', '.join(data.keys())}", 'info')
-                
-                return data
+        data = await api.get('discoverFeed', params={'page': page, 'limit': limit})
+        
+        # Log the structure for debugging
+        if log_store.is_enabled('debug'):
+            log_message('Received discover feed data. Response structure: %s', 'debug', ', '.join(data.keys()))
+        
+        return data
     except Exception as error:
         log_message(f'Error fetching discover feed: {str(error)}', 'error')
         return None
 
 async def get_discover_online_users(page=1, limit=20):
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{API_BASE_URL}{API_ENDPOINTS['discoverOnlineUsers']}?page={page}&limit={limit}", 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                return data
+        return await api.get('discoverOnlineUsers', params={'page': page, 'limit': limit})
     except Exception as error:
         log_message(f'Error fetching online users: {str(error)}', 'error')
         return None
 
 async def toggle_like(user_id):
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{API_BASE_URL}{API_ENDPOINTS['toggleLike']}{user_id}", 
-                json={}, 
-                headers=get_headers(auth.get_token())
-            ) as response:
-                data = await response.json()
-                log_message(f"✅ Successfully liked user ID: {user_id}", 'success')
-                return data
+        data = await api.post('toggleLike', str(user_id))
+        log_message('✅ Successfully liked user ID: %s', 'success', user_id)
+        return data
     except Exception as error:
-        log_message(f"❌ Error liking user ID {user_id}: {str(error)}", 'error')
+        log_message('❌ Error liking user ID %s: %s', 'error', user_id, error)
         return None
 
 # UI update functions
 async def update_user_info():
-    global user_info_content
+    global user_info_state, current_profile
     try:
         if not auth.is_authenticated():
-            user_info_content = f"{term.red}Not logged in. Please check credentials.{term.normal}"
+            user_info_state = {'status': 'logged_out'}
+            current_profile = None
             render_ui()
             return
         
-        profile_data = await get_user_profile()
-        ban_status = await check_user_ban()
+        profile = await get_user_profile()
         
-        if not profile_data:
-            user_info_content = f"{term.red}Failed to fetch user data{term.normal}"
+        if profile is None:
+            user_info_state = {'status': 'error'}
+            current_profile = None
             render_ui()
             return
         
-        ban_status_text = f"{term.red}BANNED{term.normal}" if profile_data.get('ban') else f"{term.green}NOT BANNED{term.normal}"
+        # Ban status is normally part of the profile; the separate check-ban
+        # call is only made when it is missing
+        banned = profile.banned
+        if banned is None:
+            banned = bool((await check_user_ban()).get('banned'))
         
-        user_info_content = (
-            f"{term.yellow}Username:{term.normal} {term.green}{profile_data.get('username')}{term.normal}\n" +
-            f"{term.yellow}Email:{term.normal} {term.green}{profile_data.get('email')}{term.normal}\n" +
-            f"{term.yellow}Total Reward:{term.normal} {term.green}{profile_data.get('all_reward')} AVEUM{term.normal}\n" +
-            f"{term.yellow}Ban Status:{term.normal} {ban_status_text}"
-        )
+        if profile == current_profile and banned == user_info_state.get('banned'):
+            return
+        
+        current_profile = profile
+        user_info_state = {
+            'status': 'ok',
+            'username': profile.username,
+            'email': profile.email,
+            'all_reward': profile.all_reward,
+            'banned': banned
+        }
         
         render_ui()
     except Exception as error:
         log_message(f'Error updating user info: {str(error)}', 'error')
 
+def next_mining_poll_delay(remaining_seconds):
+    # Poll more often as the deadline approaches, but always wake exactly at it
+    interval = min(max(remaining_seconds / 10, MINING_POLL_MIN_INTERVAL), MINING_POLL_MAX_INTERVAL)
+    return max(min(interval, remaining_seconds), 1)
+
 async def update_mining_status():
-    global mining_status_content
+    """Refresh the mining display, claiming and restarting sessions as needed.
+
+    Returns the number of seconds until the hub status should be checked again.
+    """
+    global mining_state, current_hub_status, mining_deadline
     try:
         if not auth.is_authenticated() or current_bot_mode != BOT_MODE['MINING']:
-            return
+            return None
         
         hub_status = await get_hub_status()
         
-        if not hub_status:
-            mining_status_content = f"{term.red}Failed to fetch mining status{term.normal}"
+        if hub_status is None:
+            mining_state = {'status': 'error'}
+            current_hub_status = None
             render_ui()
-            return
+            return MINING_RETRY_DELAY
         
-        if hub_status.get('isHub'):
-            if hub_status.get('remainingTime', 0) <= 0.001:
+        if hub_status == current_hub_status and mining_state['status'] == 'active':
+            # Nothing changed, e.g. a cached response: keep the displayed
+            # state and schedule from the deadline computed last time
+            return next_mining_poll_delay(mining_state['claim_at'] - time.time())
+        current_hub_status = None
+        
+        if hub_status.is_active:
+            remaining_time = hub_status.remaining_time
+            if remaining_time <= 0.001:
                 log_message('Mining complete! Claiming reward...', 'success')
-                await claim_reward()
+                deadline = mining_deadline if mining_deadline is not None else time.time() + remaining_time * 3600
+                claim = await claim_reward()
+                mining_deadline = None
+                if claim is not None and timeseries is not None:
+                    timeseries.record_claim(claim.get('reward'), time.time() - deadline)
                 log_message('Starting new mining session...', 'info')
                 await start_hub_mining()
-                asyncio.create_task(asyncio.sleep(2, update_mining_status()))
-                return
+                return MINING_RECHECK_DELAY
             
-            mining_status_content = (
-                f"{term.yellow}Mining Status:{term.normal} {term.green}ACTIVE{term.normal}\n" +
-                f"{term.yellow}Start Time:{term.normal} {term.green}{hub_status.get('startTime')}{term.normal}\n" +
-                f"{term.yellow}Daily Reward:{term.normal} {term.green}{hub_status.get('dailyReward')} AVEUM{term.normal}\n" +
-                f"{term.yellow}Current Earning:{term.normal} {term.green}{hub_status.get('currentEarning')} AVEUM{term.normal}\n" +
-                f"{term.yellow}Hourly Rate:{term.normal} {term.green}{hub_status.get('hourlyRate')} AVEUM/hour{term.normal}\n" +
-                f"{term.yellow}Remaining Time:{term.normal} {term.green}{format_time_remaining(hub_status.get('remainingTime', 0))}{term.normal}"
-            )
-        else:
-            mining_status_content = f"{term.yellow}Mining Status:{term.normal} {term.red}INACTIVE{term.normal}\n{term.yellow}Starting mining...{term.normal}"
-            
-            log_message('Mining is not active. Starting automatically...', 'warning')
-            await start_hub_mining()
-            
-            asyncio.create_task(asyncio.sleep(2, update_mining_status()))
+            remaining_seconds = remaining_time * 3600
+            current_hub_status = hub_status
+            mining_deadline = time.time() + remaining_seconds
+            if timeseries is not None:
+                timeseries.record_snapshot(hub_status)
+            mining_state = {
+                'status': 'active',
+                'start_time': hub_status.start_time,
+                'daily_reward': hub_status.daily_reward,
+                'current_earning': hub_status.current_earning,
+                'hourly_rate': hub_status.hourly_rate,
+                'remaining_time': remaining_time,
+                'claim_at': round(time.time() + remaining_seconds)
+            }
+            render_ui()
+            return next_mining_poll_delay(remaining_seconds)
+        
+        mining_state = {'status': 'starting'}
+        
+        log_message('Mining is not active. Starting automatically...', 'warning')
+        await start_hub_mining()
         
         render_ui()
+        return MINING_RECHECK_DELAY
     except Exception as error:
         log_message(f'Error updating mining status: {str(error)}', 'error')
-        
-        if hasattr(error, 'response') and error.response and (error.response.status == 401 or error.response.status == 403):
-            log_message('Authentication error. Trying to login again...', 'warning')
-            await auth.login()
-            
-            if auth.is_authenticated():
-                asyncio.create_task(asyncio.sleep(1, update_mining_status()))
+        return MINING_RETRY_DELAY
+
+class MiningScheduler:
+    """Single owner of the mining session lifecycle.
+
+    Sleeps until the next adaptive display poll or the session deadline,
+    whichever comes first, so claims happen on time without the constant
+    polling. wake() forces an immediate check, e.g. after a mode switch.
+    """
+
+    def __init__(self):
+        self._wake_event = None
+        self._waiters = []
+        # The first check runs as soon as run() starts
+        self._checking = True
+
+    def _get_wake_event(self):
+        if self._wake_event is None:
+            self._wake_event = asyncio.Event()
+        return self._wake_event
+
+    def wake(self):
+        self._get_wake_event().set()
+
+    async def refresh(self):
+        """Wake the scheduler and wait for its next status check to finish."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if not self._checking:
+            self.wake()
+        await waiter
+
+    async def _sleep(self, delay):
+        wake_event = self._get_wake_event()
+        try:
+            await asyncio.wait_for(wake_event.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        wake_event.clear()
+
+    async def run(self):
+        while True:
+            self._checking = True
+            try:
+                # update_mining_status returns None outside mining mode, which
+                # parks the scheduler until it is woken again
+                with metrics.time_iteration('mining'):
+                    delay = await update_mining_status()
+            finally:
+                self._checking = False
+                waiters, self._waiters = self._waiters, []
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+            await self._sleep(delay)
+
+# Create mining scheduler instance
+mining_scheduler = MiningScheduler()
+
+# Processed users
+class ProcessedUserStore:
+    """Set-like record of user IDs that auto-like has already handled.
+
+    IDs are kept in SQLite so a restart does not repeat work, with an LRU of
+    recently seen IDs in front so repeated checks skip the database. prune()
+    drops entries beyond the size cap or older than the maximum age. Until
+    open() is called the store lives in memory only.
+    """
+
+    def __init__(self, cache_size=PROCESSED_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.max_users = 0
+        self.max_age = 0
+        self._recent = OrderedDict()
+        self._count = 0
+        self._db = None
+
+    def open(self, path, max_users=0, max_age=0):
+        import sqlite3
+        self.close()
+        self.max_users = max_users
+        self.max_age = max_age
+        self._db = sqlite3.connect(path or ':memory:')
+        if path:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS processed_users '
+                '(user_id PRIMARY KEY, processed_at REAL NOT NULL) WITHOUT ROWID'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS processed_users_age ON processed_users (processed_at)')
+        self.prune()
+
+    def _get_db(self):
+        if self._db is None:
+            self.open(None)
+        return self._db
+
+    def _remember(self, user_id):
+        self._recent[user_id] = True
+        self._recent.move_to_end(user_id)
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def __contains__(self, user_id):
+        if user_id in self._recent:
+            self._recent.move_to_end(user_id)
+            return True
+        row = self._get_db().execute('SELECT 1 FROM processed_users WHERE user_id = ?', (user_id,)).fetchone()
+        if row is None:
+            return False
+        self._remember(user_id)
+        return True
+
+    def __len__(self):
+        return self._count
+
+    def add(self, user_id):
+        db = self._get_db()
+        with db:
+            inserted = db.execute(
+                'INSERT OR IGNORE INTO processed_users (user_id, processed_at) VALUES (?, ?)',
+                (user_id, time.time())
+            ).rowcount
+        self._count += inserted
+        self._remember(user_id)
+
+    def prune(self):
+        """Enforce the maximum age and size; returns the number of evicted IDs."""
+        db = self._get_db()
+        evicted = 0
+        with db:
+            if self.max_age:
+                evicted += db.execute(
+                    'DELETE FROM processed_users WHERE processed_at < ?',
+                    (time.time() - self.max_age,)
+                ).rowcount
+            count = db.execute('SELECT COUNT(*) FROM processed_users').fetchone()[0]
+            if self.max_users and count > self.max_users:
+                evicted += db.execute(
+                    'DELETE FROM processed_users WHERE user_id IN '
+                    '(SELECT user_id FROM processed_users ORDER BY processed_at LIMIT ?)',
+                    (count - self.max_users,)
+                ).rowcount
+                count = self.max_users
+        self._count = count
+        if evicted:
+            # Evicted IDs may still be in the LRU
+            self._recent.clear()
+        return evicted
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        self._recent.clear()
+        self._count = 0
+
+# Create processed users store
+processed_user_ids = ProcessedUserStore()
 
-async def ensure_mining():
+# Mining history
+def read_timeseries(path):
+    """Return all (kind, timestamp, a, b, c, d) records of a history file.
+
+    A partially written record at the end of the file is ignored.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < TIMESERIES_HEADER.size:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version = TIMESERIES_HEADER.unpack_from(data)
+            if magic != TIMESERIES_MAGIC or version != TIMESERIES_VERSION:
+                raise ValueError(f'{path} is not a version {TIMESERIES_VERSION} mining history file')
+            end = size - (size - TIMESERIES_HEADER.size) % TIMESERIES_RECORD.size
+            with memoryview(data)[TIMESERIES_HEADER.size:end] as view:
+                return list(TIMESERIES_RECORD.iter_unpack(view))
+
+def downsample_timeseries(records, now):
+    """Drop expired records and keep the last snapshot per bucket once raw data ages out."""
+    raw_after = now - TIMESERIES_RAW_DAYS * 86400
+    keep_after = now - TIMESERIES_MAX_DAYS * 86400
+    buckets = {}
+    result = []
+    for record in records:
+        kind, timestamp = record[0], record[1]
+        if timestamp < keep_after:
+            continue
+        if kind == TIMESERIES_SNAPSHOT and timestamp < raw_after:
+            buckets[int(timestamp // TIMESERIES_BUCKET)] = record
+        else:
+            result.append(record)
+    return sorted(list(buckets.values()) + result, key=lambda record: record[1])
+
+def write_timeseries(path, records):
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(TIMESERIES_HEADER.pack(TIMESERIES_MAGIC, TIMESERIES_VERSION))
+        f.write(b''.join(TIMESERIES_RECORD.pack(*record) for record in records))
+    os.replace(temp_path, path)
+
+class TimeSeriesWriter:
+    """Appends mining snapshots and claims to the history file from a background thread.
+
+    Recording only queues a tuple, so the mining loop never waits on disk.
+    The file is compacted with downsample_timeseries() when opened and then
+    every TIMESERIES_COMPACT_INTERVAL seconds, which keeps it bounded.
+    Must be created inside the running event loop, which receives the
+    writer thread's warnings.
+    """
+
+    def __init__(self, path, compact_interval=TIMESERIES_COMPACT_INTERVAL):
+        self.path = path
+        self.compact_interval = compact_interval
+        self._loop = asyncio.get_running_loop()
+        self._next_compaction = 0.0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='timeseries-writer', daemon=True)
+        self._thread.start()
+
+    def record_snapshot(self, hub_status):
+        self._queue.put((
+            TIMESERIES_SNAPSHOT, time.time(),
+            number_or_nan(hub_status.current_earning),
+            number_or_nan(hub_status.hourly_rate),
+            number_or_nan(hub_status.daily_reward),
+            number_or_nan(hub_status.remaining_time)
+        ))
+
+    def record_claim(self, reward, latency):
+        self._queue.put((TIMESERIES_CLAIM, time.time(), number_or_nan(reward), latency, float('nan'), float('nan')))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        running = True
+        while running:
+            if time.time() >= self._next_compaction:
+                try:
+                    self._compact()
+                except Exception as error:
+                    self._warn(f'Could not compact mining history: {str(error)}')
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:
+                running = False
+                batch = [record for record in batch if record is not None]
+            try:
+                if batch:
+                    with open(self.path, 'ab') as f:
+                        f.write(b''.join(TIMESERIES_RECORD.pack(*record) for record in batch))
+            except Exception as error:
+                self._warn(f'Could not write mining history: {str(error)}')
+
+    def _warn(self, message):
+        # The log store and renderer belong to the event loop thread
+        try:
+            self._loop.call_soon_threadsafe(log_message, message, 'warning')
+        except RuntimeError:
+            pass
+
+    def _compact(self):
+        now = time.time()
+        self._next_compaction = now + self.compact_interval
+        records = read_timeseries(self.path) if os.path.exists(self.path) else []
+        # Rewriting also drops a partial record left by a crash, which would
+        # otherwise misalign everything appended after it
+        write_timeseries(self.path, downsample_timeseries(records, now))
+
+def number_or_nan(value):
     try:
-        if not auth.is_authenticated() or current_bot_mode != BOT_MODE['MINING']:
-            return
-        
-        hub_status = await get_hub_status()
-        
-        if hub_status and not hub_status.get('isHub'):
-            log_message('Mining check: Mining is not active. Starting...', 'warning')
-            await start_hub_mining()
-        elif hub_status and hub_status.get('isHub') and hub_status.get('remainingTime', 0) <= 0.001:
-            log_message('Mining complete! Claiming reward...', 'success')
-            await claim_reward()
-            log_message('Starting new mining session...', 'info')
-            await start_hub_mining()
-    except Exception as error:
-        log_message(f'Error checking mining status: {str(error)}', 'error')
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+def print_timeseries_report(path, stream=None):
+    """Summarize earnings per day and claim latency from a history file."""
+    stream = stream or sys.stdout
+    records = read_timeseries(path) if os.path.exists(path) else []
+    days = defaultdict(lambda: {'snapshots': 0, 'claims': 0, 'earned': 0.0, 'latencies': []})
+    for kind, timestamp, a, b, c, d in records:
+        day = days[datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')]
+        if kind == TIMESERIES_SNAPSHOT:
+            day['snapshots'] += 1
+        elif kind == TIMESERIES_CLAIM:
+            day['claims'] += 1
+            if a == a:
+                day['earned'] += a
+            if b == b:
+                day['latencies'].append(b)
+    
+    if not days:
+        print(f'No mining history recorded in {path}', file=stream)
+        return
+    
+    print(f"{'day':<12}{'claims':>8}{'earned':>12}{'latency avg':>13}{'latency max':>13}{'snapshots':>11}", file=stream)
+    for name, day in sorted(days.items()):
+        latencies = day['latencies']
+        average = f'{sum(latencies) / len(latencies):.1f}s' if latencies else '-'
+        worst = f'{max(latencies):.1f}s' if latencies else '-'
+        print(f"{name:<12}{day['claims']:>8}{day['earned']:>12.4f}{average:>13}{worst:>13}{day['snapshots']:>11}", file=stream)
+    
+    latencies = [latency for day in days.values() for latency in day['latencies']]
+    total = sum(day['earned'] for day in days.values())
+    summary = f'Total: {sum(day["claims"] for day in days.values())} claims, {total:.4f} AVEUM'
+    if latencies:
+        latencies.sort()
+        summary += f', claim latency p50 {latencies[len(latencies) // 2]:.1f}s max {latencies[-1]:.1f}s'
+    print(summary, file=stream)
+
+# Opened by run_bot when recording is enabled
+timeseries = None
 
 async def run_auto_like():
-    global auto_like_running, auto_like_status_content, total_liked
+    global total_liked
     
-    if not auth.is_authenticated() or current_bot_mode != BOT_MODE['AUTO_LIKE'] or auto_like_running:
+    if not auth.is_authenticated() or current_bot_mode != BOT_MODE['AUTO_LIKE']:
         return
     
-    auto_like_running = True
     total_liked = 0
+    evicted = processed_user_ids.prune()
+    if evicted:
+        log_message('Forgot %d processed users past the size or age limit', 'debug', evicted)
+    update_auto_like_status(total_liked, started_at=time.time())
     
-    try:
-        async def process_users(page, source):
-            global total_liked
-            log_message(f"Fetching {source} page {page}...", 'info')
+    async def process_users(page, source):
+        global total_liked
+        log_message('Fetching %s page %d...', 'info', source, page)
+        
+        data = None
+        if source == 'discover feed':
+            data = await get_discover_feed(page, 20)
+        else:
+            data = await get_discover_online_users(page, 20)
+        
+        if not data:
+            log_message('Could not fetch %s', 'warning', source)
+            return 0
+        
+        users = []
+        if 'users' in data and isinstance(data['users'], list):
+            users = data['users']
+            log_message('Found %d users in %s', 'info', len(users), source)
+        elif 'posts' in data and isinstance(data['posts'], list):
+            users = [{'id': post.get('user_id') or post.get('id'), 
+                      'username': post.get('username'), 
+                      'is_liked': post.get('liked')} for post in data['posts']]
+            log_message('Found %d posts in %s', 'info', len(users), source)
+        else:
+            log_message('Unexpected data structure in %s. Available keys: %s', 'warning', source, ', '.join(data.keys()))
+            return 0
+        
+        liked_count = 0
+        
+        for user in users:
+            if current_bot_mode != BOT_MODE['AUTO_LIKE']:
+                break
             
-            data = None
-            if source == 'discover feed':
-                data = await get_discover_feed(page, 20)
-            else:
-                data = await get_discover_online_users(page, 20)
+            if user['id'] is None or user['id'] in processed_user_ids:
+                continue
             
-            if not data:
-                log_message(f"Could not fetch {source}", 'warning')
-                return 0
+            if user.get('is_liked'):
+                processed_user_ids.add(user['id'])
+                continue
             
-            users = []
-            if 'users' in data and isinstance(data['users'], list):
-                users = data['users']
-                log_message(f"Found {len(users)} users in {source}", 'info')
-            elif 'posts' in data and isinstance(data['posts'], list):
-                users = [{'id': post.get('user_id') or post.get('id'), 
-                          'username': post.get('username'), 
-                          'is_liked': post.get('liked')} for post in data['posts']]
-                log_message(f"Found {len(users)} posts in {source}", 'info')
+            if user.get('username'):
+                log_message('Liking user ID: %s (%s)...', 'info', user['id'], user['username'])
             else:
-                log_message(f"Unexpected data structure in {source}. Available keys: {', '.join(data.keys())}", 'warning')
-                return 0
+                log_message('Liking user ID: %s...', 'info', user['id'])
+            await toggle_like(user['id'])
+            processed_user_ids.add(user['id'])
+            total_liked += 1
+            liked_count += 1
             
-            liked_count = 0
+            update_auto_like_status(total_liked)
             
-            for user in users:
-                if current_bot_mode != BOT_MODE['AUTO_LIKE']:
-                    break
-                
-                if user['id'] in processed_user_ids:
-                    continue
-                
-                if user.get('is_liked'):
-                    processed_user_ids.add(user['id'])
-                    continue
-                
-                log_message(f"Liking user ID: {user['id']}{f' ({user.get('username')})' if user.get('username') else ''}...", 'info')
-                await toggle_like(user['id'])
-                processed_user_ids.add(user['id'])
-                total_liked += 1
-                liked_count += 1
-                
-                update_auto_like_status(total_liked)
-                
-                delay = get_random_delay(2000, 5000)
-                log_message(f"Waiting {delay/1000} seconds before next like...", 'info')
-                await asyncio.sleep(delay / 1000)
-            
-            return liked_count
+            delay = get_random_delay(2000, 5000)
+            log_message('Waiting %.1f seconds before next like...', 'info', delay / 1000)
+            await asyncio.sleep(delay / 1000)
         
-        current_page = 1
-        max_pages = 5
+        return liked_count
+    
+    current_page = 1
+    max_pages = 5
+    
+    while current_page <= max_pages and current_bot_mode == BOT_MODE['AUTO_LIKE']:
+        total_processed = 0
         
-        while current_page <= max_pages and current_bot_mode == BOT_MODE['AUTO_LIKE']:
-            total_processed = 0
-            
-            total_processed += await process_users(current_page, 'discover feed')
-            
-            if total_processed < 5 and current_bot_mode == BOT_MODE['AUTO_LIKE']:
-                await process_users(current_page, 'online users')
-            
-            current_page += 1
-            
-            if current_page <= max_pages and current_bot_mode == BOT_MODE['AUTO_LIKE']:
-                page_delay = get_random_delay(5000, 10000)
-                log_message(f"Waiting {page_delay/1000} seconds before fetching next page...", 'info')
-                await asyncio.sleep(page_delay / 1000)
+        total_processed += await process_users(current_page, 'discover feed')
         
-        log_message(f"Auto-like session completed. Liked {total_liked} users.", 'success')
+        if total_processed < 5 and current_bot_mode == BOT_MODE['AUTO_LIKE']:
+            await process_users(current_page, 'online users')
         
-        if current_bot_mode == BOT_MODE['AUTO_LIKE']:
-            reset_delay = get_random_delay(60000, 120000)
-            log_message(f"Taking a break. Will restart auto-like in {reset_delay/1000} seconds...", 'info')
-            
-            async def restart_auto_like():
-                await asyncio.sleep(reset_delay / 1000)
-                global auto_like_running
-                auto_like_running = False
-                if current_bot_mode == BOT_MODE['AUTO_LIKE']:
-                    await run_auto_like()
-            
-            asyncio.create_task(restart_auto_like())
-        else:
-            auto_like_running = False
+        current_page += 1
         
-    except Exception as error:
-        log_message(f"Error in auto-like: {str(error)}", 'error')
-        auto_like_running = False
-        
-        if hasattr(error, 'response') and error.response and (error.response.status == 401 or error.response.status == 403):
-            log_message('Authentication error. Trying to login again...', 'warning')
-            await auth.login()
-        
-        async def retry_auto_like():
-            await asyncio.sleep(10)
-            if current_bot_mode == BOT_MODE['AUTO_LIKE']:
-                global auto_like_running
-                auto_like_running = False
-                await run_auto_like()
-        
-        asyncio.create_task(retry_auto_like())
-
-def update_auto_like_status(total_liked):
-    global auto_like_status_content
-    auto_like_status_content = (
-        f"{term.yellow}Auto Like Status:{term.normal} {term.green}ACTIVE{term.normal}\n" +
-        f"{term.yellow}Total Users Liked:{term.normal} {term.green}{total_liked}{term.normal}\n" +
-        f"{term.yellow}Processed Users:{term.normal} {term.green}{len(processed_user_ids)}{term.normal}\n" +
-        f"{term.yellow}Started At:{term.normal} {term.green}{datetime.now().strftime('%H:%M:%S')}{term.normal}"
-    )
+        if current_page <= max_pages and current_bot_mode == BOT_MODE['AUTO_LIKE']:
+            page_delay = get_random_delay(5000, 10000)
+            log_message('Waiting %.1f seconds before fetching next page...', 'info', page_delay / 1000)
+            await asyncio.sleep(page_delay / 1000)
+    
+    log_message('Auto-like session completed. Liked %d users.', 'success', total_liked)
+
+async def auto_like_loop():
+    while current_bot_mode == BOT_MODE['AUTO_LIKE']:
+        with metrics.time_iteration('auto_like'):
+            await run_auto_like()
+        
+        reset_delay = get_random_delay(60000, 120000)
+        log_message('Taking a break. Will restart auto-like in %.1f seconds...', 'info', reset_delay / 1000)
+        await asyncio.sleep(reset_delay / 1000)
+
+def update_auto_like_status(total_liked, started_at=None):
+    global auto_like_state
+    auto_like_state = {
+        'status': 'active',
+        'total_liked': total_liked,
+        'processed': len(processed_user_ids),
+        'started_at': started_at or auto_like_state.get('started_at')
+    }
     render_ui()
 
 def update_mode_display():
@@ -537,79 +1894,719 @@ def toggle_bot_mode():
     if current_bot_mode == BOT_MODE['MINING']:
         current_bot_mode = BOT_MODE['AUTO_LIKE']
         log_message('Switching to AUTO LIKE mode', 'info')
-        if not auto_like_running:
-            asyncio.create_task(run_auto_like())
+        supervisor.spawn('auto_like', auto_like_loop, restart='on_failure', restart_delay=AUTO_LIKE_RETRY_DELAY)
     else:
         current_bot_mode = BOT_MODE['MINING']
         log_message('Switching to MINING mode', 'info')
-        asyncio.create_task(asyncio.sleep(1, update_mining_status()))
+        supervisor.cancel('auto_like')
+        mining_scheduler.wake()
     
     update_mode_display()
 
-def render_ui():
-    # Clear the screen
-    print(term.clear)
+# Background jobs
+class Supervisor:
+    """Owns every background job of the bot.
+
+    Jobs are named and isolated from one another: a failure is logged and,
+    depending on the job's restart policy ('never', 'on_failure' or
+    'always'), the job is restarted with exponential backoff. shutdown()
+    drains in-flight requests before cancelling the jobs and closing the
+    HTTP session.
+    """
+
+    def __init__(self):
+        self.stopping = False
+        self._jobs = {}
+
+    def spawn(self, name, factory, restart='on_failure', restart_delay=RESTART_DELAY):
+        if self.is_running(name):
+            return self._jobs[name]
+        task = asyncio.ensure_future(self._supervise(name, factory, restart, restart_delay))
+        self._jobs[name] = task
+        task.add_done_callback(lambda done, name=name: self._forget(name, done))
+        return task
+
+    def _forget(self, name, task):
+        if self._jobs.get(name) is task:
+            del self._jobs[name]
+
+    async def _supervise(self, name, factory, restart, restart_delay):
+        delay = restart_delay
+        while True:
+            try:
+                await factory()
+                if restart != 'always':
+                    return
+                delay = restart_delay
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                log_message(f'Background job {name} failed: {str(error)}', 'error')
+                if restart == 'never':
+                    return
+            if self.stopping:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_MAX_DELAY)
+
+    def is_running(self, name):
+        task = self._jobs.get(name)
+        return task is not None and not task.done()
+
+    def cancel(self, name):
+        task = self._jobs.pop(name, None)
+        if task is not None:
+            task.cancel()
+
+    async def shutdown(self, grace_period=SHUTDOWN_GRACE_PERIOD):
+        self.stopping = True
+        await api.drain(grace_period)
+        tasks = list(self._jobs.values())
+        self._jobs.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await api.close()
+
+# Create supervisor instance
+supervisor = Supervisor()
+
+# Terminal renderer
+class Renderer:
+    """Differential renderer that rewrites only the screen lines that changed.
+
+    Redraw requests are coalesced, so a burst of state changes produces a
+    single frame, and frames are capped at ``max_fps`` per second.
+    """
+
+    def __init__(self, max_fps, stream=None):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.stream = stream
+        self.frames = 0
+        self._last_lines = []
+        self._last_size = None
+        self._last_render = 0.0
+        self._pending = None
+        # Per region: (lines and size, truncated lines, truncation by line)
+        self._regions = {}
+        self._cursor = (None, 0)
+
+    def request(self):
+        # Without init_terminal() (tooling that only uses the API layer)
+        # there is nothing to draw on
+        if self._pending is not None or term is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Nothing is drawn before the event loop starts; the first frame
+            # rendered inside the loop picks up whatever changed until then.
+            return
+        delay = max(0.0, self._last_render + self.min_interval - time.monotonic())
+        self._pending = loop.call_later(delay, self.flush)
+
+    def invalidate(self):
+        self._last_lines = []
+        self._last_size = None
+
+    def flush(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        
+        started = time.perf_counter()
+        width, height = term.width, term.height
+        size = (width, height)
+        lines = []
+        for region, region_lines in build_frame():
+            key = (tuple(region_lines), size)
+            cached = self._regions.get(region)
+            if cached is None or cached[0] != key:
+                # Only lines that changed since the region was last drawn at
+                # this size are truncated again
+                known = cached[2] if cached is not None and cached[0][1] == size else {}
+                truncated = {line: known[line] if line in known else truncate(line, width) for line in region_lines}
+                cached = (key, [truncated[line] for line in region_lines], truncated)
+                self._regions[region] = cached
+            lines.extend(cached[1])
+        
+        if height:
+            lines = lines[:height]
+        
+        if size != self._last_size:
+            output = [term.home + term.clear]
+            previous = []
+        else:
+            output = []
+            previous = self._last_lines
+        
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                output.append(term.move_xy(0, row) + line + term.clear_eol)
+        if len(lines) < len(previous):
+            output.append(term.move_xy(0, len(lines)) + term.clear_eos)
+        
+        self._last_lines = lines
+        self._last_size = size
+        self._last_render = time.monotonic()
+        
+        if not output:
+            return
+        
+        # Leave the cursor at the end of the command prompt
+        if lines:
+            if self._cursor[0] != lines[-1]:
+                self._cursor = (lines[-1], term.length(lines[-1]))
+            output.append(term.move_xy(self._cursor[1], len(lines) - 1))
+        
+        stream = self.stream or sys.stdout
+        stream.write(''.join(output))
+        stream.flush()
+        self.frames += 1
+        metrics.observe_render(time.perf_counter() - started)
+
+def truncate(line, width):
+    # Plain ASCII that fits needs no escape-sequence-aware measuring
+    if not width or (len(line) <= width and line.isascii()):
+        return line
+    return term.truncate(line, width)
+
+# Create renderer instance; run_bot swaps in a HeadlessReporter when headless
+renderer = Renderer(UI_MAX_FPS)
+
+def init_terminal(force_styling=False):
+    global term
+    if term is None:
+        # Imported here so that importing this module stays cheap
+        import blessed
+        term = blessed.Terminal(force_styling=force_styling)
+    return term
+
+def format_field(label, value):
+    return f"{term.yellow}{label}:{term.normal} {term.green}{value}{term.normal}"
+
+def format_user_info(state):
+    if state['status'] == 'loading':
+        return ['Loading user info...']
+    if state['status'] == 'logged_out':
+        return [f"{term.red}Not logged in. Please check credentials.{term.normal}"]
+    if state['status'] == 'error':
+        return [f"{term.red}Failed to fetch user data{term.normal}"]
     
-    # Header
-    print(term.center(f"{term.cyan}SAVAN MINING BOTx{term.normal}"))
+    ban_status_text = f"{term.red}BANNED{term.normal}" if state['banned'] else f"{term.green}NOT BANNED{term.normal}"
+    return [
+        format_field('Username', state['username']),
+        format_field('Email', state['email']),
+        format_field('Total Reward', f"{state['all_reward']} AVEUM"),
+        f"{term.yellow}Ban Status:{term.normal} {ban_status_text}"
+    ]
+
+def format_mining_status(state):
+    if state['status'] == 'loading':
+        return ['Loading mining status...']
+    if state['status'] == 'error':
+        return [f"{term.red}Failed to fetch mining status{term.normal}"]
+    if state['status'] == 'starting':
+        return [
+            f"{term.yellow}Mining Status:{term.normal} {term.red}INACTIVE{term.normal}",
+            f"{term.yellow}Starting mining...{term.normal}"
+        ]
     
-    # Mode
+    return [
+        format_field('Mining Status', 'ACTIVE'),
+        format_field('Start Time', state['start_time']),
+        format_field('Daily Reward', f"{state['daily_reward']} AVEUM"),
+        format_field('Current Earning', f"{state['current_earning']} AVEUM"),
+        format_field('Hourly Rate', f"{state['hourly_rate']} AVEUM/hour"),
+        format_field('Remaining Time', format_time_remaining(state['remaining_time'])),
+        format_field('Claim At', datetime.fromtimestamp(state['claim_at']).strftime('%H:%M:%S'))
+    ]
+
+def format_auto_like_status(state):
+    if state['status'] == 'idle':
+        return ['Auto Like status will appear here when active']
+    
+    return [
+        format_field('Auto Like Status', 'ACTIVE'),
+        format_field('Total Users Liked', state['total_liked']),
+        format_field('Processed Users', state['processed']),
+        format_field('Started At', datetime.fromtimestamp(state['started_at']).strftime('%H:%M:%S'))
+    ]
+
+# Centered static lines, rebuilt only when the terminal width changes
+centered_lines = {}
+
+def center(text, width):
+    key = (text, width)
+    line = centered_lines.get(key)
+    if line is None:
+        if len(centered_lines) > 64:
+            centered_lines.clear()
+        line = centered_lines[key] = term.center(text, width)
+    return line
+
+# Formatted status lines, reused until the state object they came from is replaced
+formatted_regions = {}
+
+def format_cached(region, state, formatter):
+    entry = formatted_regions.get(region)
+    if entry is None or entry[0] is not state:
+        entry = (state, formatter(state))
+        formatted_regions[region] = entry
+    return entry[1]
+
+def build_frame():
+    frame = []
+    width = term.width
+    
+    # Header
     mode_color = term.green if current_bot_mode == BOT_MODE['MINING'] else term.cyan
-    print(term.center(f"CURRENT MODE: {mode_color}{current_mode}{term.normal}"))
-    print(term.center("=" * 50))
+    frame.append(('header', [
+        center(f"{term.cyan}SAVAN MINING BOTx{term.normal}", width),
+        center(f"CURRENT MODE: {mode_color}{current_mode}{term.normal}", width),
+        center("=" * 50, width)
+    ]))
     
     # User info
-    print(f"{term.yellow}USER INFO:{term.normal}")
-    print(user_info_content)
-    print(term.center("=" * 50))
+    frame.append(('user_info', [
+        f"{term.yellow}USER INFO:{term.normal}",
+        *format_cached('user_info', user_info_state, format_user_info),
+        center("=" * 50, width)
+    ]))
     
     # Status box
     if current_bot_mode == BOT_MODE['MINING']:
-        print(f"{term.yellow}MINING STATUS:{term.normal}")
-        print(mining_status_content)
+        status_lines = [f"{term.yellow}MINING STATUS:{term.normal}", *format_cached('mining', mining_state, format_mining_status)]
     else:
-        print(f"{term.yellow}AUTO LIKE STATUS:{term.normal}")
-        print(auto_like_status_content)
-    print(term.center("=" * 50))
+        status_lines = [f"{term.yellow}AUTO LIKE STATUS:{term.normal}", *format_cached('auto_like', auto_like_state, format_auto_like_status)]
+    status_lines.append(center("=" * 50, width))
+    frame.append(('status', status_lines))
     
     # Log box
-    print(f"{term.yellow}LOG:{term.normal}")
-    for message in log_messages[-8:]:  # Show only the last 8 log messages
-        print(message)
+    frame.append(('log', [
+        f"{term.yellow}LOG:{term.normal}",
+        *(record.display() for record in log_store.tail(8))  # Show only the last 8 log messages
+    ]))
+    
+    # Metrics panel
+    frame.append(('metrics', [
+        center("=" * 50, width),
+        f"{term.yellow}METRICS:{term.normal}",
+        *metrics.summary_lines()
+    ]))
     
     # Status bar with commands
-    print(term.center("=" * 50))
-    print(term.center(f"{term.bold}{term.yellow}AVAILABLE COMMANDS{term.normal}"))
-    print(term.center("-" * 50))
-    print(term.center(f"{term.bold}{term.red}[1]{term.normal} = Exit Bot"))
-    print(term.center(f"{term.bold}{term.green}[2]{term.normal} = Refresh Token"))
-    print(term.center(f"{term.bold}{term.cyan}[3]{term.normal} = Switch Mode (Mining/Auto-Like)"))
-    print(term.center("=" * 50))
-    print(f"\n{term.bold}{term.yellow}Enter Command Number (1-3):{term.normal} ", end='', flush=True)
-
-async def run_bot():
+    frame.append(('commands', [
+        center("=" * 50, width),
+        center(f"{term.bold}{term.yellow}AVAILABLE COMMANDS{term.normal}", width),
+        center("-" * 50, width),
+        center(f"{term.bold}{term.red}[1]{term.normal} = Exit Bot", width),
+        center(f"{term.bold}{term.green}[2]{term.normal} = Refresh Token", width),
+        center(f"{term.bold}{term.cyan}[3]{term.normal} = Switch Mode (Mining/Auto-Like)", width),
+        center(f"{term.bold}{term.magenta}[4]{term.normal} = {'Stop' if profiler.is_active() else 'Start'} Profiler", width),
+        center("=" * 50, width),
+        "",
+        f"{term.bold}{term.yellow}Press Command Number (1-4):{term.normal} "
+    ]))
+    
+    return frame
+
+def render_ui():
+    renderer.request()
+
+def state_snapshot():
+    return {
+        'mode': {'mode': current_bot_mode},
+        'user': user_info_state,
+        'mining': mining_state,
+        'auto_like': auto_like_state
+    }
+
+# Headless output
+class HeadlessReporter:
+    """Reports state transitions as JSON lines instead of drawing a terminal UI.
+
+    Like the renderer, bursts of requests are coalesced and only sections
+    whose state changed since the last report are written. It also acts as
+    a log sink, so log records are reported as 'log' events.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.frames = 0
+        self._last_state = {}
+        self._pending = None
+
+    def request(self):
+        if self._pending is not None:
+            return
+        try:
+            self._pending = asyncio.get_running_loop().call_soon(self.flush)
+        except RuntimeError:
+            return
+
+    def invalidate(self):
+        self._last_state = {}
+
+    def flush(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        
+        state = state_snapshot()
+        for section, value in state.items():
+            if self._last_state.get(section) != value:
+                self.write_event(section, value)
+        self._last_state = state
+
+    def close(self):
+        # The status stream belongs to the caller
+        self.flush()
+
+    def emit(self, record):
+        self.write_event('log', {'level': record.level, 'message': record.text()}, record.created)
+
+    def write_event(self, event, data, created=None):
+        line = json.dumps({
+            'time': datetime.fromtimestamp(created or time.time()).isoformat(timespec='milliseconds'),
+            'event': event,
+            'data': data
+        }, ensure_ascii=False)
+        stream = self.stream or sys.stdout
+        stream.write(line + '\n')
+        stream.flush()
+        self.frames += 1
+
+async def serve_control_socket(path, commands):
+    """Accept control commands, one per line, on a local Unix socket.
+
+    Commands are the names in CONTROL_COMMANDS or their numbers; 'status'
+    replies with the current state as JSON.
+    """
+    clients = set()
+    
+    async def handle_client(reader, writer):
+        clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                name = line.decode(errors='replace').strip().lower()
+                if name == 'status':
+                    reply = json.dumps(state_snapshot())
+                elif name in CONTROL_COMMANDS or name in CONTROL_COMMANDS.values():
+                    commands.put_nowait(CONTROL_COMMANDS.get(name, name))
+                    reply = 'ok'
+                else:
+                    reply = f'error: unknown command {name!r}'
+                writer.write((reply + '\n').encode())
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            # The bot is shutting down or the client went away
+            pass
+        finally:
+            clients.discard(writer)
+            writer.close()
+    
+    # Replace a socket left behind by a previous run, but never a regular file
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.remove(path)
+    server = await asyncio.start_unix_server(handle_client, path)
+    os.chmod(path, 0o600)
+    log_message(f'Listening for control commands on {path}', 'info')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.close()
+        for writer in list(clients):
+            writer.close()
+        await server.wait_closed()
+        if os.path.exists(path):
+            os.remove(path)
+
+# Record and replay
+def redact(value):
+    if isinstance(value, dict):
+        return {
+            key: 'REDACTED' if key in CASSETTE_REDACTED_FIELDS and value[key] is not None else redact(value[key])
+            for key in value
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+class CassetteRecorder:
+    """Writes every API response, with secrets redacted, to a JSON-lines cassette.
+
+    Request bodies are never written; the first line is a header.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._started = time.monotonic()
+        self._file = open(path, 'w', encoding='utf-8')
+        os.chmod(path, 0o600)
+        self._write({'version': CASSETTE_VERSION, 'recorded_at': datetime.now().isoformat(timespec='seconds')})
+
+    def record(self, method, endpoint, suffix, params, status, data, elapsed):
+        self._write({
+            't': round(time.monotonic() - self._started, 6),
+            'method': method,
+            'endpoint': endpoint,
+            'suffix': suffix,
+            'params': params,
+            'status': status,
+            'elapsed': round(elapsed, 6),
+            'body': redact(data)
+        })
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class CassettePlayer:
+    """Serves recorded responses in place of the network.
+
+    Installed as ``api.transport``. Each request gets the next unused
+    recorded response of its endpoint, with the body re-encoded up front so
+    decoding is timed as it is live.
+    """
+
+    def __init__(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get('version') != CASSETTE_VERSION:
+            raise ValueError(f'{path} is not a version {CASSETTE_VERSION} cassette')
+        self.interactions = lines[1:]
+        self.used = [False] * len(self.interactions)
+        self._bodies = [
+            None if entry['body'] is None else json.dumps(entry['body']).encode()
+            for entry in self.interactions
+        ]
+        self._pending = defaultdict(deque)
+        for index, entry in enumerate(self.interactions):
+            self._pending[entry['endpoint']].append(index)
+
+    async def send(self, method, endpoint, suffix, params, json, token):
+        pending = self._pending[endpoint]
+        while pending and self.used[pending[0]]:
+            pending.popleft()
+        if not pending:
+            raise LookupError(f'No recorded {endpoint} response left')
+        index = pending.popleft()
+        self.used[index] = True
+        return self.interactions[index]['status'], self._bodies[index]
+
+async def replay_cassette(path, speed=0.0, headless=False):
+    """Replay a cassette through the normal update and render code paths.
+
+    Each recorded hub status or profile response drives one call of
+    update_mining_status() or update_user_info(), followed by a frame. Other
+    recorded responses are served when those calls request them. With
+    ``speed`` > 0 the recorded gaps are replayed that many times faster;
+    otherwise steps run back to back. Returns per-stage timings in seconds.
+    """
+    global renderer, RETRY_BASE_DELAY, TOKEN_CACHE_PATH
+    
+    player = CassettePlayer(path)
+    output = open(os.devnull, 'w')
+    if headless:
+        renderer = HeadlessReporter(output)
+    else:
+        init_terminal(force_styling=True)
+        renderer = Renderer(0, output)
+    api.transport = player.send
+    # Recorded logins must not need credentials or overwrite the token cache
+    TOKEN_CACHE_PATH = ''
+    auth.require_credentials = False
+    auth.set_token('replay')
+    # Recorded retries are replayed as they come, without backoff sleeps
+    RETRY_BASE_DELAY = 0
+    drivers = {'hubStatus': update_mining_status, 'profile': update_user_info}
+    
+    spans = []
+    metrics.span_listeners.append(lambda name, elapsed: spans.append((name, elapsed)))
+    stages = {'decode': [], 'model_update': [], 'render': []}
+    previous_t = None
+    started = time.perf_counter()
+    try:
+        for index, entry in enumerate(player.interactions):
+            if player.used[index] or entry['endpoint'] not in REPLAY_DRIVERS:
+                continue
+            if speed > 0 and previous_t is not None:
+                await asyncio.sleep(max(0.0, entry['t'] - previous_t) / speed)
+            previous_t = entry['t']
+            
+            response_cache.invalidate()
+            del spans[:]
+            step_started = time.perf_counter()
+            await drivers[entry['endpoint']]()
+            step_time = time.perf_counter() - step_started
+            
+            # Decoding and any frame flushed during the step are not part of
+            # the model update
+            decode_time = sum(elapsed for name, elapsed in spans if name == 'decode')
+            render_time = sum(elapsed for name, elapsed in spans if name == 'render')
+            stages['model_update'].append(step_time - decode_time - render_time)
+            stages['decode'].extend(elapsed for name, elapsed in spans if name == 'decode')
+            
+            render_started = time.perf_counter()
+            renderer.flush()
+            stages['render'].append(render_time + time.perf_counter() - render_started)
+    finally:
+        metrics.span_listeners.pop()
+        api.transport = api._fetch
+        output.close()
+    
+    stages['total'] = [time.perf_counter() - started]
+    stages['steps'] = len(stages['model_update'])
+    stages['unused'] = player.used.count(False)
+    return stages
+
+def print_replay_report(stages, stream=None):
+    stream = stream or sys.stdout
+    print(f"Replayed {stages['steps']} steps in {stages['total'][0] * 1000:.1f} ms ({stages['unused']} recorded responses unused)", file=stream)
+    print(f"{'stage':<14}{'count':>8}{'total ms':>11}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}", file=stream)
+    for name in ('decode', 'model_update', 'render'):
+        values = sorted(stages[name])
+        if not values:
+            print(f'{name:<14}{0:>8}', file=stream)
+            continue
+        p50 = values[len(values) // 2]
+        p99 = values[min(len(values) - 1, int(0.99 * len(values)))]
+        print(
+            f'{name:<14}{len(values):>8}{sum(values) * 1000:>11.2f}{sum(values) / len(values) * 1e6:>10.1f}'
+            f'{p50 * 1e6:>10.1f}{p99 * 1e6:>10.1f}',
+            file=stream
+        )
+
+# Keyboard input
+class KeyReader:
+    """Reads keypresses on a background thread and puts them on a command queue.
+
+    The terminal is put in cbreak mode so single keypresses are delivered
+    without waiting for Enter, and the event loop never blocks on stdin.
+    """
+
+    def __init__(self, terminal, queue, poll_interval=0.2):
+        self.terminal = terminal
+        self.poll_interval = poll_interval
+        self._queue = queue
+        self._loop = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='key-reader', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        with self.terminal.cbreak():
+            while not self._stop.is_set():
+                key = self.terminal.inkey(timeout=self.poll_interval)
+                # Raw escape and control sequences would move the cursor when
+                # echoed in a log line, so queue their names instead
+                if key.is_sequence:
+                    key = key.name
+                elif not str(key).isprintable():
+                    key = None
+                if key:
+                    self._loop.call_soon_threadsafe(self._queue.put_nowait, str(key))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            # Joining lets the thread leave cbreak mode and restore the terminal
+            self._thread.join(timeout=self.poll_interval * 5)
+            self._thread = None
+
+async def run_bot(interactive=True, commands=None, headless=False, status_stream=None, control_socket=None):
+    """Run the bot until an exit command is received.
+
+    With ``interactive=False`` no keyboard is read and commands only arrive
+    through ``commands``, the control socket and signals, e.g. for
+    benchmarks. With ``headless=True`` no terminal is set up at all and
+    state transitions are written as JSON lines to ``status_stream``.
+    """
+    global renderer, timeseries
+    
+    started = time.perf_counter()
+    if headless:
+        interactive = False
+        renderer = HeadlessReporter(status_stream)
+        log_store.sinks.append(renderer)
+    else:
+        init_terminal()
+    
+    if LOG_FILE:
+        log_store.sinks.append(JsonLinesSink(LOG_FILE))
+    
     log_message('Starting Aveum Mining Bot...', 'info')
     
-    login_success = await auth.login()
+    try:
+        processed_user_ids.open(PROCESSED_DB_PATH, PROCESSED_MAX_USERS, PROCESSED_MAX_AGE_DAYS * 86400)
+    except Exception as error:
+        log_message(f'Could not open processed users database, keeping them in memory: {str(error)}', 'warning')
+        processed_user_ids.open(None, PROCESSED_MAX_USERS, PROCESSED_MAX_AGE_DAYS * 86400)
+    
+    if TIMESERIES_PATH:
+        timeseries = TimeSeriesWriter(TIMESERIES_PATH)
+    
+    login_success = auth.load_cached_token() or await auth.login()
     if not login_success:
         log_message('Failed to login. Please check your credentials in .env file.', 'error')
+        await supervisor.shutdown()
+        close_stores()
+        close_log_sinks()
         return
     
-    await update_user_info()
     update_mode_display()
-    await update_mining_status()
     
-    # Set up refresh intervals
-    refresh_task = asyncio.create_task(refresh_loop())
-    mining_check_task = asyncio.create_task(mining_check_loop())
+    # Set up background jobs
+    supervisor.spawn('mining', mining_scheduler.run, restart='always')
+    await gather_bounded(update_user_info(), mining_scheduler.refresh())
+    metrics.observe_startup(time.perf_counter() - started)
+    log_message('First status shown after %.0f ms', 'debug', metrics.time_to_first_status * 1000)
+    supervisor.spawn('refresh', refresh_loop, restart='always')
+    supervisor.spawn('loop_lag', monitor_loop_lag, restart='always')
+    if METRICS_PORT:
+        supervisor.spawn('metrics_server', serve_metrics, restart='on_failure')
+    
+    # Set up command handling; keypresses, control socket commands and
+    # signals share a queue
+    if commands is None:
+        commands = asyncio.Queue()
+    if control_socket:
+        supervisor.spawn('control_socket', lambda: serve_control_socket(control_socket, commands), restart='on_failure')
+    key_reader = KeyReader(term, commands)
+    if interactive:
+        key_reader.start()
+    
+    loop = asyncio.get_running_loop()
+    signal_commands = [(signal.SIGINT, '1'), (signal.SIGTERM, '1')]
+    for name, signal_command in (('SIGHUP', '2'), ('SIGUSR2', '3'), ('SIGUSR1', '4')):
+        if hasattr(signal, name):
+            signal_commands.append((getattr(signal, name), signal_command))
+    for signum, signal_command in signal_commands:
+        try:
+            loop.add_signal_handler(signum, commands.put_nowait, signal_command)
+        except (NotImplementedError, RuntimeError):
+            pass
     
-    # Set up command handling
     while True:
         render_ui()
         
         try:
-            # Get command from user
-            command = input().strip()
+            # Wait for a command without blocking the event loop
+            command = (await commands.get()).strip()
+            if not command:
+                continue
             
             # Process command
             if command == '1':
@@ -621,56 +2618,143 @@ async def run_bot():
             elif command == '3':
                 log_message('Toggling mode...', 'info')
                 toggle_bot_mode()
+            elif command == '4':
+                profiler.toggle()
             else:
-                log_message(f'Invalid command: {command}. Please enter 1, 2, or 3.', 'error')
+                log_message(f'Invalid command: {command}. Please enter 1, 2, 3 or 4.', 'error')
         except Exception as e:
             log_message(f'Error processing command: {str(e)}', 'error')
     
     # Clean up
-    refresh_task.cancel()
-    mining_check_task.cancel()
+    key_reader.stop()
+    if profiler.is_active():
+        profiler.stop()
     log_message('Shutting down bot...', 'warning')
-    await asyncio.sleep(1)
-    os._exit(0)
+    await supervisor.shutdown()
+    close_stores()
+    renderer.flush()
+    if not headless:
+        print(term.normal)
+    close_log_sinks()
+
+def close_stores():
+    global timeseries
+    processed_user_ids.close()
+    if timeseries is not None:
+        timeseries.close()
+        timeseries = None
 
 async def refresh_loop():
     while True:
-        await update_user_info()
-        if current_bot_mode == BOT_MODE['MINING']:
-            await update_mining_status()
+        with metrics.time_iteration('refresh'):
+            await update_user_info()
         await asyncio.sleep(10)
 
-async def mining_check_loop():
-    while True:
-        if current_bot_mode == BOT_MODE['MINING']:
-            await ensure_mining()
-        elif current_bot_mode == BOT_MODE['AUTO_LIKE'] and not auto_like_running:
-            await run_auto_like()
-        await asyncio.sleep(30)
-
 async def refresh_token():
     log_message('Manually refreshing authentication token...', 'info')
-    await auth.login()
+    await auth.relogin()
     if auth.is_authenticated():
         log_message('Token refreshed successfully!', 'success')
-        await update_user_info()
-        if current_bot_mode == BOT_MODE['MINING']:
-            await update_mining_status()
-
-# Check if .env file exists, create if not
-if not os.path.exists('.env'):
-    with open('.env', 'w') as f:
-        f.write('AVEUM_EMAIL=youremail@gmail.com\nAVEUM_PASSWORD=\n')
-    log_message('Created .env file with template. Please fill in your credentials.', 'info')
-else:
-    # Check if .env file is empty or has template values
-    with open('.env', 'r') as f:
-        content = f.read().strip()
-        if not content or 'youremail@gmail.com' in content:
-            with open('.env', 'w') as f:
-                f.write('AVEUM_EMAIL=youremail@gmail.com\nAVEUM_PASSWORD=\n')
-            log_message('Created .env file with template. Please fill in your credentials.', 'info')
+        await gather_bounded(update_user_info(), mining_scheduler.refresh())
+
+# Startup
+def ensure_env_file(path=ENV_FILE):
+    """Create a credentials template if the .env file is missing.
+
+    An existing file is never rewritten; a warning is logged instead when it
+    still holds the template values.
+    """
+    if not os.path.exists(path):
+        with open(path, 'w') as f:
+            f.write(ENV_TEMPLATE)
+        os.chmod(path, 0o600)
+        log_message('Created .env file with template. Please fill in your credentials.', 'info')
+        return
+    
+    if not os.getenv('AVEUM_PASSWORD') or os.getenv('AVEUM_EMAIL') in (None, '', 'youremail@gmail.com'):
+        log_message('The .env file has no credentials yet. Please fill in AVEUM_EMAIL and AVEUM_PASSWORD.', 'warning')
+
+def print_debug_info(path=ENV_FILE):
+    """Print startup diagnostics to stderr without revealing any secrets."""
+    print('DEBUG: Environment variables loaded:', file=sys.stderr)
+    print(f"AVEUM_EMAIL set: {bool(os.getenv('AVEUM_EMAIL'))}", file=sys.stderr)
+    print(f"AVEUM_PASSWORD set: {bool(os.getenv('AVEUM_PASSWORD'))}", file=sys.stderr)
+    print(f'API base URL: {API_BASE_URL}', file=sys.stderr)
+    print(f'Current working directory: {os.getcwd()}', file=sys.stderr)
+    print(f'.env file exists: {os.path.exists(path)}', file=sys.stderr)
+
+def configure():
+    """Load the .env file and apply its settings to the shared components."""
+    global renderer
+    import dotenv
+    dotenv.load_dotenv(ENV_FILE)
+    load_settings()
+    api.base_url = API_BASE_URL
+    log_store.level = LOG_LEVEL
+    renderer = Renderer(UI_MAX_FPS)
+    if DEBUG:
+        print_debug_info()
+    ensure_env_file()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Aveum Mining Bot')
+    parser.add_argument(
+        '--headless', action='store_true',
+        default=os.getenv('AVEUM_HEADLESS', '').lower() in ('1', 'true', 'yes'),
+        help='run without the terminal UI and report state as JSON lines (AVEUM_HEADLESS)'
+    )
+    parser.add_argument(
+        '--status-file', default=os.getenv('AVEUM_STATUS_FILE'),
+        help='write headless JSON lines to this file instead of stdout (AVEUM_STATUS_FILE)'
+    )
+    parser.add_argument(
+        '--control-socket', default=os.getenv('AVEUM_CONTROL_SOCKET'),
+        help='accept control commands on this Unix socket (AVEUM_CONTROL_SOCKET)'
+    )
+    parser.add_argument(
+        '--record', metavar='CASSETTE', default=os.getenv('AVEUM_RECORD'),
+        help='record API responses, with secrets redacted, to a cassette file (AVEUM_RECORD)'
+    )
+    parser.add_argument(
+        '--replay', metavar='CASSETTE',
+        help='replay a cassette offline through the update and render pipeline, print stage timings and exit'
+    )
+    parser.add_argument(
+        '--replay-speed', type=float, default=0.0,
+        help='replay recorded gaps this many times faster; 0 runs steps back to back (default)'
+    )
+    parser.add_argument(
+        '--report', action='store_true',
+        help='print earnings per day and claim latency from the mining history and exit (AVEUM_TIMESERIES)'
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    configure()
+    args = parse_args(argv)
+    if args.report:
+        print_timeseries_report(TIMESERIES_PATH)
+        return
+    if args.replay:
+        print_replay_report(asyncio.run(replay_cassette(args.replay, args.replay_speed, args.headless)))
+        return
+    status_stream = open(args.status_file, 'a', encoding='utf-8') if args.headless and args.status_file else None
+    if args.record:
+        api.recorder = CassetteRecorder(args.record)
+    try:
+        asyncio.run(run_bot(
+            interactive=not args.headless,
+            headless=args.headless,
+            status_stream=status_stream,
+            control_socket=args.control_socket
+        ))
+    finally:
+        if status_stream is not None:
+            status_stream.close()
+        if api.recorder is not None:
+            api.recorder.close()
 
 # Run the bot
 if __name__ == "__main__":
-    asyncio.run(run_bot()) 
+    main()
+
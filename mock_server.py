@@ -0,0 +1,216 @@
+import time
+import json
+import base64
+import random
+import asyncio
+import argparse
+import secrets
+from collections import Counter
+from aiohttp import web
+
+# Local stand-in for the Aveum API, used for offline benchmarks.
+# Point the bot at it with AVEUM_API_BASE_URL=http://127.0.0.1:<port>
+
+# Endpoints that are exempt from injected failures
+CONTROL_ROUTES = ('/__stats',)
+
+# A session may be claimed this many seconds before it ends, matching the
+# bot's own remainingTime threshold
+CLAIM_TOLERANCE = 5
+
+class MockConfig:
+    def __init__(self, latency=50, jitter=20, error_rate=0.0, token_ttl=3600,
+                 hub_duration=24 * 3600, daily_reward=12.0, page_size=20):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.token_ttl = token_ttl
+        self.hub_duration = hub_duration
+        self.daily_reward = daily_reward
+        self.page_size = page_size
+
+class MockState:
+    def __init__(self, config):
+        self.config = config
+        self.tokens = {}
+        self.hub_started_at = None
+        self.all_reward = 0.0
+        self.liked = set()
+        self.requests = Counter()
+        self.errors = Counter()
+
+    def issue_token(self):
+        expires_at = time.time() + self.config.token_ttl
+        header = base64.urlsafe_b64encode(b'{"alg":"none","typ":"JWT"}').decode().rstrip('=')
+        claims = json.dumps({'sub': 'mock-user', 'exp': int(expires_at)}).encode()
+        token = f"{header}.{base64.urlsafe_b64encode(claims).decode().rstrip('=')}.{secrets.token_hex(8)}"
+        self.tokens[token] = expires_at
+        return token
+
+    def is_valid(self, request):
+        authorization = request.headers.get('authorization', '')
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else None
+        return token is not None and self.tokens.get(token, 0) > time.time()
+
+    def hub_elapsed(self):
+        return min(time.time() - self.hub_started_at, self.config.hub_duration)
+
+    def current_earning(self):
+        if self.hub_started_at is None:
+            return 0.0
+        return round(self.config.daily_reward * self.hub_elapsed() / (24 * 3600), 6)
+
+def json_error(status, message):
+    return web.json_response({'message': message}, status=status)
+
+@web.middleware
+async def simulate_network(request, handler):
+    state = request.app['state']
+    config = state.config
+    if request.path in CONTROL_ROUTES:
+        return await handler(request)
+
+    route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+    state.requests[route] += 1
+
+    delay = max(0.0, random.gauss(config.latency, config.jitter)) / 1000
+    await asyncio.sleep(delay)
+
+    if config.error_rate and random.random() < config.error_rate:
+        state.errors[route] += 1
+        return json_error(500, 'Injected failure')
+
+    if not route.endswith('/login') and not state.is_valid(request):
+        return json_error(401, 'Unauthorized')
+
+    return await handler(request)
+
+async def login(request):
+    state = request.app['state']
+    payload = await request.json()
+    if not payload.get('email') or not payload.get('password'):
+        return json_error(400, 'Missing credentials')
+    return web.json_response({'token': state.issue_token()})
+
+async def start_hub(request):
+    state = request.app['state']
+    state.hub_started_at = time.time()
+    return web.json_response({'startTime': datetime_string(state.hub_started_at)})
+
+async def stop_hub(request):
+    state = request.app['state']
+    state.hub_started_at = None
+    return web.json_response({'message': 'Hub stopped'})
+
+async def hub_status(request):
+    state = request.app['state']
+    config = state.config
+    if state.hub_started_at is None:
+        return web.json_response({'isHub': False})
+
+    remaining_seconds = config.hub_duration - state.hub_elapsed()
+    return web.json_response({
+        'isHub': True,
+        'startTime': datetime_string(state.hub_started_at),
+        'dailyReward': config.daily_reward,
+        'currentEarning': state.current_earning(),
+        'hourlyRate': round(config.daily_reward / 24, 6),
+        'remainingTime': remaining_seconds / 3600
+    })
+
+async def profile(request):
+    state = request.app['state']
+    return web.json_response({
+        'username': 'mock-user',
+        'email': 'mock@example.com',
+        'all_reward': round(state.all_reward, 6),
+        'ban': False
+    })
+
+async def check_ban(request):
+    return web.json_response({'banned': False})
+
+async def claim_reward(request):
+    state = request.app['state']
+    if state.hub_started_at is None or state.hub_elapsed() < state.config.hub_duration - CLAIM_TOLERANCE:
+        return json_error(400, 'Mining session is not complete')
+    reward = state.current_earning()
+    state.all_reward += reward
+    state.hub_started_at = None
+    return web.json_response({'reward': reward})
+
+def page_of_users(request, liked_key):
+    state = request.app['state']
+    page = int(request.query.get('page', 1))
+    limit = min(int(request.query.get('limit', state.config.page_size)), 100)
+    first_id = (page - 1) * limit + 1
+    return [
+        {'id': user_id, 'username': f'user{user_id}', liked_key: user_id in state.liked}
+        for user_id in range(first_id, first_id + limit)
+    ]
+
+async def discover_feed(request):
+    posts = page_of_users(request, 'liked')
+    return web.json_response({'posts': [
+        {'id': post['id'] + 100000, 'user_id': post['id'], 'username': post['username'], 'liked': post['liked']}
+        for post in posts
+    ]})
+
+async def discover_online_users(request):
+    return web.json_response({'users': page_of_users(request, 'is_liked')})
+
+async def toggle_like(request):
+    state = request.app['state']
+    user_id = int(request.match_info['user_id'])
+    state.liked ^= {user_id}
+    return web.json_response({'liked': user_id in state.liked})
+
+async def stats(request):
+    state = request.app['state']
+    return web.json_response({'requests': dict(state.requests), 'errors': dict(state.errors)})
+
+def datetime_string(timestamp):
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp))
+
+def create_app(config):
+    app = web.Application(middlewares=[simulate_network])
+    app['state'] = MockState(config)
+    app.router.add_post('/users/login', login)
+    app.router.add_post('/users/start-hub', start_hub)
+    app.router.add_post('/users/stop-hub', stop_hub)
+    app.router.add_get('/users/hub-status', hub_status)
+    app.router.add_get('/users/profile', profile)
+    app.router.add_get('/users/check-ban', check_ban)
+    app.router.add_post('/users/claim-reward', claim_reward)
+    app.router.add_get('/users/discover-feed', discover_feed)
+    app.router.add_get('/users/discover-online-users', discover_online_users)
+    app.router.add_post('/users/toggle-like/{user_id}', toggle_like)
+    app.router.add_get('/__stats', stats)
+    return app
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Local mock of the Aveum API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=50, help='mean response latency in ms')
+    parser.add_argument('--jitter', type=float, default=20, help='latency standard deviation in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with HTTP 500')
+    parser.add_argument('--token-ttl', type=float, default=3600, help='token lifetime in seconds')
+    parser.add_argument('--hub-duration', type=float, default=24 * 3600, help='mining session length in seconds')
+    parser.add_argument('--daily-reward', type=float, default=12.0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        token_ttl=args.token_ttl,
+        hub_duration=args.hub_duration,
+        daily_reward=args.daily_reward
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()